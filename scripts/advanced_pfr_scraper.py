@@ -280,9 +280,9 @@ class AdvancedPFRScraper:
         
         all_data = []
         
-        for idx, row in players_df.iterrows():
-            player_id = row['player_id']
-            player_name = row['player']
+        for idx, row in enumerate(players_df.itertuples(index=False)):
+            player_id = row.player_id
+            player_name = row.player
             
             print(f"\n[{idx+1}/{len(players_df)}] Processing {player_name} ({player_id})")
             
@@ -290,6 +290,13 @@ class AdvancedPFRScraper:
             game_stats = self.scrape_player_stats_advanced(player_id, season)
             
             if game_stats:
+                # Convert the counting stats once and total them in one pass
+                games_df = pd.DataFrame(game_stats)
+                stat_cols = ['rush_att', 'rush_yds', 'rec', 'rec_yds']
+                totals = games_df[stat_cols].astype(int).sum()
+                total_touches = totals['rush_att'] + totals['rec']
+                total_yards = totals['rush_yds'] + totals['rec_yds']
+                
                 # Calculate season totals
                 season_totals = {
                     'player_id': player_id,
@@ -297,30 +304,21 @@ class AdvancedPFRScraper:
                     'season': season,
                     'age': None,  # We'll add this later if needed
                     'games_played': len(game_stats),
-                    'total_rush_att': sum(int(g.get('rush_att', 0)) for g in game_stats),
-                    'total_rush_yds': sum(int(g.get('rush_yds', 0)) for g in game_stats),
-                    'total_rec': sum(int(g.get('rec', 0)) for g in game_stats),
-                    'total_rec_yds': sum(int(g.get('rec_yds', 0)) for g in game_stats),
-                    'total_touches': sum(int(g.get('rush_att', 0)) + int(g.get('rec', 0)) for g in game_stats),
-                    'avg_touches_per_game': sum(int(g.get('rush_att', 0)) + int(g.get('rec', 0)) for g in game_stats) / len(game_stats) if game_stats else 0
+                    'total_rush_att': totals['rush_att'],
+                    'total_rush_yds': totals['rush_yds'],
+                    'total_rec': totals['rec'],
+                    'total_rec_yds': totals['rec_yds'],
+                    'total_touches': total_touches,
+                    'avg_touches_per_game': total_touches / len(game_stats),
+                    'avg_yards_per_touch': total_yards / total_touches if total_touches > 0 else 0
                 }
                 
-                # Calculate yards per touch
-                total_touches = season_totals['total_touches']
-                if total_touches > 0:
-                    total_yards = season_totals['total_rush_yds'] + season_totals['total_rec_yds']
-                    season_totals['avg_yards_per_touch'] = total_yards / total_touches
-                else:
-                    season_totals['avg_yards_per_touch'] = 0
-                
                 all_data.append(season_totals)
                 print(f"  ✓ Added season totals for {player_name}")
                 
                 # Save individual game data
                 game_data_file = f"data/weekly_raw/{season}/{player_id}_games.csv"
                 os.makedirs(os.path.dirname(game_data_file), exist_ok=True)
-                
-                games_df = pd.DataFrame(game_stats)
                 games_df.to_csv(game_data_file, index=False)
                 print(f"  ✓ Saved {len(game_stats)} games to {game_data_file}")
             
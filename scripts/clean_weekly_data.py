@@ -10,6 +10,14 @@ import os
 import glob
 from pathlib import Path
 
+from weekly_cache import CleanedFileCache
+
+# Injury indicators: Did Not Play, Inactive, Injured Reserve, PUP, Suspended
+INJURY_PATTERN = 'did not play|inactive|injured reserve|pup|suspended'
+
+NUMERIC_COLUMNS = frozenset(['Rk', 'Gcar', 'Gtm', 'Week', 'Att', 'Yds', 'TD', 'Y/A', 'Tgt', 'Rec', 'Y/R', 'Ctch%', 'Y/Tgt', 'Fmb', 'FL', 'FF', 'FR', 'FRTD', 'OffSnp', 'Off%', 'DefSnp', 'Def%', 'STSnp', 'ST%'])
+TEXT_COLUMNS = frozenset(['Team', 'Opp', 'Result', 'GS'])
+
 def clean_individual_csv(file_path):
     """Clean an individual CSV file and return a cleaned DataFrame."""
     print(f"Cleaning {os.path.basename(file_path)}...")
@@ -33,12 +41,10 @@ def clean_individual_csv(file_path):
                     clean_columns.append(str(col).strip())
             
             # Use the first row as headers and drop it from data
-            df_clean = df.iloc[1:].copy()
+            # reset_index already returns a new frame, so no extra copy is needed
+            df_clean = df.iloc[1:].reset_index(drop=True)
             df_clean.columns = clean_columns
             
-            # Reset index
-            df_clean = df_clean.reset_index(drop=True)
-            
             # Add metadata
             filename = os.path.basename(file_path)
             player_id = filename.split('_')[0]
@@ -61,49 +67,49 @@ def clean_individual_csv(file_path):
 def clean_data_types(df):
     """Clean and convert data types."""
     # Convert numeric columns
-    numeric_columns = ['Rk', 'Gcar', 'Gtm', 'Week', 'Att', 'Yds', 'TD', 'Y/A', 'Tgt', 'Rec', 'Y/R', 'Ctch%', 'Y/Tgt', 'Fmb', 'FL', 'FF', 'FR', 'FRTD', 'OffSnp', 'Off%', 'DefSnp', 'Def%', 'STSnp', 'ST%']
-    
-    for col in numeric_columns:
-        if col in df.columns:
-            # Replace empty strings and 'NaN' with actual NaN
-            df[col] = df[col].replace(['', 'NaN', 'nan'], np.nan)
-            # Convert to numeric, errors='coerce' will turn non-numeric to NaN
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    numeric_present = df.columns.intersection(NUMERIC_COLUMNS)
+    if len(numeric_present) > 0:
+        # Replace empty strings and 'NaN' with actual NaN, then
+        # convert to numeric, errors='coerce' will turn non-numeric to NaN
+        df[numeric_present] = (
+            df[numeric_present]
+            .replace(['', 'NaN', 'nan'], np.nan)
+            .apply(pd.to_numeric, errors='coerce')
+        )
     
     # Clean date column
     if 'Date' in df.columns:
         df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
     
     # Clean text columns
-    text_columns = ['Team', 'Opp', 'Result', 'GS']
-    for col in text_columns:
-        if col in df.columns:
-            df[col] = df[col].astype(str).replace('nan', np.nan)
+    for col in df.columns.intersection(TEXT_COLUMNS):
+        # Mask placeholders in place rather than round-tripping through astype(str)
+        values = df[col]
+        df[col] = values.mask(values.isna() | (values == 'nan') | (values == ''), np.nan)
     
     return df
 
 def create_injury_indicators(df):
     """Create injury indicators from the data."""
-    # A player is considered injured if they have "Did Not Play" or similar indicators
-    injury_indicators = [
-        'Did Not Play',
-        'Inactive',
-        'Injured Reserve',
-        'PUP',
-        'Suspended'
-    ]
-    
-    # Check various columns for injury indicators
-    df['injured'] = False
+    # A player is considered injured if they have "Did Not Play" or similar indicators.
+    # Each column is scanned once with Arrow's regex kernel instead of once per indicator.
+    injured = np.zeros(len(df), dtype=bool)
     
     for col in ['GS', 'Result', 'Team']:
         if col in df.columns:
-            for indicator in injury_indicators:
-                df.loc[df[col].astype(str).str.contains(indicator, case=False, na=False), 'injured'] = True
+            # Arrow-backed strings route str.contains to pyarrow.compute; the
+            # copy is local so the caller's column dtypes are left alone
+            values = df[col].astype('string[pyarrow]')
+            injured |= values.str.contains(INJURY_PATTERN, case=False, regex=True, na=False).to_numpy(dtype=bool)
     
-    # Also check if key stats are missing (might indicate injury)
+    # Also check if key stats are missing (might indicate injury).
+    # Missing counts as zero, so each column needs a single comparison.
     if 'Att' in df.columns and 'Rec' in df.columns:
-        df.loc[(df['Att'].isna() | (df['Att'] == 0)) & (df['Rec'].isna() | (df['Rec'] == 0)), 'injured'] = True
+        att = np.nan_to_num(df['Att'].to_numpy(np.float64, na_value=np.nan))
+        rec = np.nan_to_num(df['Rec'].to_numpy(np.float64, na_value=np.nan))
+        injured |= (att == 0) & (rec == 0)
+    
+    df['injured'] = injured
     
     return df
 
@@ -128,16 +134,26 @@ def main():
     
     print(f"Found {len(csv_files)} CSV files to clean")
     
-    # Clean each file
+    # Clean each file, reusing cached output for files that have not changed
+    cache = CleanedFileCache(os.path.join(output_dir, 'cache', Path(__file__).stem), __file__)
     cleaned_data = []
     successful_files = 0
     
     for csv_file in csv_files:
-        cleaned_df = clean_individual_csv(csv_file)
+        cleaned_df = cache.get(csv_file)
+        if cleaned_df is not None:
+            print(f"Using cached {os.path.basename(csv_file)}")
+        else:
+            cleaned_df = clean_individual_csv(csv_file)
+            if cleaned_df is not None:
+                cache.put(csv_file, cleaned_df)
+        
         if cleaned_df is not None:
             cleaned_data.append(cleaned_df)
             successful_files += 1
     
+    cache.save()
+    
     if not cleaned_data:
         print("No files could be cleaned successfully!")
         return
@@ -5,129 +5,234 @@ Combine all seasons (2021-2024) into a final multi-season dataset.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import os
 import glob
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def combine_all_seasons():
-    """Combine data from all seasons into a final dataset."""
-    print("Combining All Seasons (2021-2024)")
-    print("=" * 40)
-    
-    # Input directories for each season
-    season_dirs = {
-        '2021': 'data/processed_2021',
-        '2022': 'data/processed_2022', 
-        '2023': 'data/processed_2023',
-        '2024': 'data/final_combined'
-    }
-    
-    # Output directory
-    output_dir = "data/multi_season_final"
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    all_season_data = []
-    seasons_processed = 0
+import joblib
+
+from weekly_cache import file_signature
+
+# Input directories for each season
+SEASON_DIRS = {
+    '2021': 'data/processed_2021',
+    '2022': 'data/processed_2022',
+    '2023': 'data/processed_2023',
+    '2024': 'data/final_combined'
+}
+
+# Compact read dtypes: small nullable ints for counts and categoricals for the
+# low-cardinality text keys; everything else keeps the Arrow-backed defaults
+READ_DTYPES = {
+    'Week': 'Int8',
+    'season': 'Int16',
+    'Att': 'Int16',
+    'Yds': 'Int16',
+    'TD': 'Int8',
+    'Rec': 'Int16',
+    'player_id': 'category',
+    'Team': 'category',
+    'Opp': 'category',
+    'Result': 'category',
+    'GS': 'category'
+}
+
+# On-disk memo of the load + feature engineering step, keyed on input file
+# signatures and this script's own signature. Anchored at the repo root so the
+# cache does not depend on the working directory.
+memory = joblib.Memory(Path(__file__).resolve().parent.parent / 'cache', verbose=0)
+
+def shift_within_groups(codes, values, periods):
+    """Shift values down by `periods` rows within runs of equal group codes.
     
-    for season, dir_path in season_dirs.items():
-        print(f"\n📅 Processing {season} season...")
-        
-        # Look for combined data file
-        combined_file = os.path.join(dir_path, f"{season}_combined_data.csv")
-        if season == '2024':
-            combined_file = os.path.join(dir_path, "final_combined_data.csv")
-        
-        if os.path.exists(combined_file):
-            try:
-                df = pd.read_csv(combined_file)
-                all_season_data.append(df)
-                seasons_processed += 1
-                print(f"  ✅ Loaded {len(df)} games from {season}")
-            except Exception as e:
-                print(f"  ❌ Error loading {season}: {e}")
-        else:
-            print(f"  ⚠️  No combined data found for {season} at {combined_file}")
+    Rows must already be sorted by group. Positions with no earlier row in the
+    same group get 0, matching groupby().shift(periods).fillna(0).
+    """
+    shifted = np.zeros(len(values), dtype=np.float64)
+    if periods < len(values):
+        same_group = (codes[periods:] == codes[:-periods]) & (codes[periods:] >= 0)
+        shifted[periods:] = np.where(same_group, values[:-periods], 0.0)
+    return shifted
+
+def cumsum_prior_within_groups(codes, values):
+    """Running total of values before each row, restarting at each new group.
     
-    if not all_season_data:
-        print("\n❌ No season data found to combine!")
-        return
+    Rows must already be sorted by group, so each group is a contiguous run.
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.float64)
     
-    print(f"\n🔄 Combining {seasons_processed} seasons...")
+    totals = np.cumsum(values) - values
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(values)])
+    return totals - np.repeat(totals[starts], run_lengths)
+
+def season_data_file(season, dir_path):
+    """Return the combined data file for a season directory."""
+    if season == '2024':
+        return os.path.join(dir_path, "final_combined_data.csv")
+    return os.path.join(dir_path, f"{season}_combined_data.csv")
+
+def _load_season_file(combined_file):
+    """Read a season's combined data file, or return None if it is missing."""
+    if not os.path.exists(combined_file):
+        return None
+    return pd.read_csv(combined_file, dtype=READ_DTYPES, dtype_backend="pyarrow")
+
+def restore_categoricals(df):
+    """Re-categorize READ_DTYPES category columns after a concat.
     
+    Frames read from different files carry different categories, which
+    concat falls back to object for.
+    """
+    for col, dtype in READ_DTYPES.items():
+        if dtype == 'category' and col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def _standardize_and_concat(dfs):
+    """Align season frames on the union of their columns and concatenate."""
     # Get all unique columns
     all_columns = set()
-    for df in all_season_data:
+    for df in dfs:
         all_columns.update(df.columns)
     
     all_columns = sorted(list(all_columns))
     print(f"Total unique columns: {len(all_columns)}")
     
-    # Standardize all dataframes
-    standardized_dfs = []
-    for df in all_season_data:
-        df_copy = df.copy()
-        for col in all_columns:
-            if col not in df_copy.columns:
-                df_copy[col] = np.nan
-        df_copy = df_copy[all_columns]
-        standardized_dfs.append(df_copy)
-    
-    # Combine all seasons
-    final_df = pd.concat(standardized_dfs, ignore_index=True)
-    
-    # Create additional features for injury modeling
-    print("Creating additional features for injury modeling...")
+    # Standardize all dataframes: add missing columns and reorder in one step
+    standardized_dfs = [df.reindex(columns=all_columns) for df in dfs]
     
+    return restore_categoricals(pd.concat(standardized_dfs, ignore_index=True, sort=False))
+
+def _engineer_features(df):
+    """Sort games per player and add workload and injury-history features."""
     # Sort by player and season for proper feature engineering
-    final_df = final_df.sort_values(['player_id', 'season', 'Week']).reset_index(drop=True)
+    df = df.sort_values(['player_id', 'season', 'Week']).reset_index(drop=True)
+    
+    # Player codes over the sorted frame let lag features use array slices
+    # instead of a separate groupby per column
+    player_codes = df['player_id'].factorize()[0]
+    att = df['Att'].to_numpy(dtype=np.float64, na_value=0.0)
     
     # Create rolling features
-    final_df['touches_prev'] = final_df.groupby('player_id')['Att'].shift(1).fillna(0)
-    final_df['touches_prev_2'] = final_df.groupby('player_id')['Att'].shift(2).fillna(0)
-    final_df['touches_prev_3'] = final_df.groupby('player_id')['Att'].shift(3).fillna(0)
+    df['touches_prev'] = shift_within_groups(player_codes, att, 1)
+    df['touches_prev_2'] = shift_within_groups(player_codes, att, 2)
+    df['touches_prev_3'] = shift_within_groups(player_codes, att, 3)
     
     # Career touches prior to current game
-    final_df['career_touches_prior'] = final_df.groupby('player_id')['Att'].expanding().sum().shift(1).fillna(0)
+    df['career_touches_prior'] = cumsum_prior_within_groups(player_codes, att)
     
     # Prior multi-week injuries (games missed in previous 3 weeks)
-    final_df['prior_multiweek_prev'] = final_df.groupby('player_id')['injured'].rolling(3, min_periods=1).sum().shift(1).fillna(0)
+    injured = df['injured'].to_numpy(dtype=np.float64, na_value=0.0)
+    df['prior_multiweek_prev'] = sum(shift_within_groups(player_codes, injured, k) for k in (1, 2, 3))
     
     # Age (approximate based on season)
-    final_df['age'] = final_df['season'] - 1995  # Rough estimate, can be refined
+    df['age'] = df['season'] - 1995  # Rough estimate, can be refined
+    
+    return df
+
+@memory.cache
+def _build_dataset(season_files, file_signatures, code_signature):
+    """Load, combine and feature-engineer the given season files.
+    
+    file_signatures and code_signature only feed the cache key, so editing an
+    input file or this script (including the helpers called from here)
+    invalidates the cached result.
+    """
+    all_season_data = []
+    
+    # Read the season files concurrently; the parser releases the GIL for most of the work
+    with ThreadPoolExecutor(max_workers=max(1, len(season_files))) as executor:
+        futures = {season: executor.submit(_load_season_file, path) for season, path in season_files.items()}
+    
+    for season, future in futures.items():
+        print(f"\n📅 Processing {season} season...")
+        
+        try:
+            df = future.result()
+        except Exception as e:
+            print(f"  ❌ Error loading {season}: {e}")
+            continue
+        
+        if df is None:
+            print(f"  ⚠️  No combined data found for {season} at {season_files[season]}")
+        else:
+            all_season_data.append(df)
+            print(f"  ✅ Loaded {len(df)} games from {season}")
+    
+    if not all_season_data:
+        return None
+    
+    print(f"\n🔄 Combining {len(all_season_data)} seasons...")
+    final_df = _standardize_and_concat(all_season_data)
+    
+    # Create additional features for injury modeling
+    print("Creating additional features for injury modeling...")
+    return _engineer_features(final_df)
+
+def combine_all_seasons(season_dirs=None):
+    """Combine data from all seasons into a final dataset."""
+    if season_dirs is None:
+        season_dirs = SEASON_DIRS
+    
+    print(f"Combining Seasons ({', '.join(season_dirs)})")
+    print("=" * 40)
+    
+    # Output directory
+    output_dir = "data/multi_season_final"
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    season_files = {season: season_data_file(season, dir_path) for season, dir_path in season_dirs.items()}
+    file_signatures = {
+        season: (os.path.getmtime(path), os.path.getsize(path)) if os.path.exists(path) else None
+        for season, path in season_files.items()
+    }
+    
+    code_signature = file_signature(__file__)
+    
+    if _build_dataset.check_call_in_cache(season_files, file_signatures, code_signature):
+        print("\n♻️  Inputs and code unchanged, using the cached combined dataset")
+    final_df = _build_dataset(season_files, file_signatures, code_signature)
+    
+    if final_df is None:
+        print("\n❌ No season data found to combine!")
+        return
     
     # Save the final multi-season dataset
     output_file = os.path.join(output_dir, "multi_season_injury_data.csv")
-    final_df.to_csv(output_file, index=False)
+    # Arrow's multi-threaded writer instead of pandas' per-cell Python formatting
+    pacsv.write_csv(pa.Table.from_pandas(final_df, preserve_index=False), output_file)
     
     print(f"\n✅ Successfully created multi-season dataset!")
     print(f"Output file: {output_file}")
     print(f"Total games: {len(final_df)}")
     print(f"Total players: {final_df['player_id'].nunique()}")
-    print(f"Seasons: {sorted(final_df['season'].unique())}")
+    print(f"Seasons: {sorted(final_df['season'].unique().tolist())}")
     print(f"Total columns: {len(final_df.columns)}")
     
     # Show season breakdown
     print(f"\n📊 Season breakdown:")
-    season_summary = final_df.groupby('season').agg({
-        'player_id': 'nunique',
-        'Week': 'count',
-        'injured': 'sum'
-    }).round(1)
-    season_summary.columns = ['Players', 'Games', 'Injured_Games']
+    season_summary = final_df.groupby('season', observed=True).agg(
+        Players=('player_id', 'nunique'),
+        Games=('Week', 'count'),
+        Injured_Games=('injured', 'sum')
+    )
     print(season_summary.to_string())
     
-    # Show injury summary
+    # Show injury summary (only the top 10 is printed, so take it with nlargest)
     print(f"\n🏥 Injury summary:")
-    injury_summary = final_df.groupby('player_id').agg({
-        'season': 'count',
-        'injured': 'sum',
-        'Att': 'sum',
-        'Yds': 'sum',
-        'TD': 'sum'
-    }).round(1)
-    injury_summary.columns = ['Total_Games', 'Injured_Games', 'Total_Att', 'Total_Yds', 'Total_TD']
-    injury_summary = injury_summary.sort_values('Injured_Games', ascending=False)
-    print(injury_summary.head(10).to_string())
+    injury_summary = final_df.groupby('player_id', observed=True).agg(
+        Total_Games=('season', 'count'),
+        Injured_Games=('injured', 'sum'),
+        Total_Att=('Att', 'sum'),
+        Total_Yds=('Yds', 'sum'),
+        Total_TD=('TD', 'sum')
+    ).nlargest(10, 'Injured_Games')
+    print(injury_summary.to_string())
     
     # Show sample of final data
     print(f"\n📋 Sample of final dataset:")
@@ -5,10 +5,16 @@ Combine the individually processed files into a final dataset.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import os
+import re
 import glob
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from combine_all_seasons import READ_DTYPES, restore_categoricals
+
 def main():
     """Main function to combine processed files."""
     print("Combining Processed Files")
@@ -30,12 +36,15 @@ def main():
     
     print(f"Found {len(csv_files)} processed files to combine")
     
-    # Read all files
+    # Read all files concurrently, then report on them in order
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(pd.read_csv, csv_file, dtype=READ_DTYPES, dtype_backend="pyarrow") for csv_file in csv_files]
+    
     all_data = []
-    for csv_file in csv_files:
+    for csv_file, future in zip(csv_files, futures):
         print(f"Reading {os.path.basename(csv_file)}...")
         try:
-            df = pd.read_csv(csv_file)
+            df = future.result()
             all_data.append(df)
             print(f"  ✓ Read {len(df)} games with {len(df.columns)} columns")
         except Exception as e:
@@ -57,38 +66,45 @@ def main():
     all_columns = sorted(list(all_columns))
     print(f"Total unique columns: {len(all_columns)}")
     
-    # Standardize all dataframes
-    standardized_dfs = []
-    for df in all_data:
-        df_copy = df.copy()
-        for col in all_columns:
-            if col not in df_copy.columns:
-                df_copy[col] = np.nan
-        df_copy = df_copy[all_columns]
-        standardized_dfs.append(df_copy)
-    
-    # Combine
-    combined_df = pd.concat(standardized_dfs, ignore_index=True)
+    # Standardize each dataframe as it is consumed by concat, then drop the
+    # per-file frames so only the combined copy stays in memory
+    combined_df = pd.concat((df.reindex(columns=all_columns) for df in all_data), ignore_index=True, sort=False)
+    combined_df = restore_categoricals(combined_df)
+    del all_data
     
-    # Create injury indicators
+    # Create injury indicators, accumulated in a plain boolean array and assigned once
     print("Creating injury indicators...")
-    combined_df['injured'] = False
+    injured = np.zeros(len(combined_df), dtype=bool)
     
-    # Check for injury indicators
+    # Check for injury indicators with a single alternation scan per column
     injury_indicators = ['Did Not Play', 'Inactive', 'Injured Reserve', 'PUP', 'Suspended']
+    injury_pattern = '|'.join(map(re.escape, injury_indicators))
     
     for col in ['GS', 'Result', 'Team']:
-        if col in combined_df.columns:
-            for indicator in injury_indicators:
-                combined_df.loc[combined_df[col].astype(str).str.contains(indicator, case=False, na=False), 'injured'] = True
+        if col not in combined_df.columns:
+            continue
+        values = combined_df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Scan the few distinct categories and map back through the codes;
+            # the trailing False is picked up by code -1 (missing)
+            hits = values.cat.categories.astype('string').str.contains(injury_pattern, case=False, regex=True, na=False)
+            injured |= np.append(hits.to_numpy(dtype=bool), False)[values.cat.codes.to_numpy()]
+        else:
+            matches = values.astype('string').str.contains(injury_pattern, case=False, regex=True, na=False)
+            injured |= matches.to_numpy(dtype=bool)
     
     # Also check if key stats are missing (might indicate injury)
     if 'Att' in combined_df.columns and 'Rec' in combined_df.columns:
-        combined_df.loc[(combined_df['Att'].isna() | (combined_df['Att'] == 0)) & (combined_df['Rec'].isna() | (combined_df['Rec'] == 0)), 'injured'] = True
+        att_missing = (combined_df['Att'].isna() | combined_df['Att'].eq(0)).to_numpy(dtype=bool)
+        rec_missing = (combined_df['Rec'].isna() | combined_df['Rec'].eq(0)).to_numpy(dtype=bool)
+        injured |= att_missing & rec_missing
+    
+    combined_df['injured'] = injured
     
     # Save the combined data
     output_file = os.path.join(output_dir, "final_combined_data.csv")
-    combined_df.to_csv(output_file, index=False)
+    # Arrow's multi-threaded writer instead of pandas' per-cell Python formatting
+    pacsv.write_csv(pa.Table.from_pandas(combined_df, preserve_index=False), output_file)
     
     print(f"\n✅ Successfully combined all game data!")
     print(f"Output file: {output_file}")
@@ -103,9 +119,12 @@ def main():
     if available_cols:
         print(combined_df[available_cols].head(10).to_string(index=False))
     
+    # Group by player once and reuse the grouper for both per-player summaries
+    player_groups = combined_df.groupby('player_id', observed=True)
+    
     # Show injury summary
     if 'injured' in combined_df.columns:
-        injury_summary = combined_df.groupby('player_id')['injured'].sum().sort_values(ascending=False)
+        injury_summary = player_groups['injured'].sum().sort_values(ascending=False)
         print(f"\nInjury summary (games missed per player):")
         print(injury_summary.head(10).to_string())
     
@@ -118,7 +137,7 @@ def main():
     
     # Show player summary
     print(f"\nPlayer summary:")
-    player_summary = combined_df.groupby('player_id').agg({
+    player_summary = player_groups.agg({
         'Week': 'count',
         'Att': 'sum',
         'Yds': 'sum',
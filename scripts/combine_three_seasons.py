@@ -76,7 +76,8 @@ def combine_three_seasons():
     # Calculate features for each player separately to avoid index issues
     for player_id in combined_df['player_id'].unique():
         player_mask = combined_df['player_id'] == player_id
-        player_data = combined_df[player_mask].copy()
+        # Boolean indexing already returns new data, so no copy is needed
+        player_data = combined_df[player_mask]
         
         if len(player_data) > 0:
             # Previous touches
@@ -5,10 +5,33 @@ This generates insights about RB injury patterns and model performance.
 """
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; the dashboard is only saved to disk
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
 
+def summarize_bins(df, column, bins, labels, mean_columns, name=None, right=True):
+    """Count rows and average mean_columns within each bin of df[column].
+    
+    Matches pd.cut(df[column], bins, right=right) followed by a groupby
+    count/mean, but bins with np.digitize and aggregates with np.bincount.
+    Rows outside the bin edges are dropped; empty bins get a NaN mean.
+    """
+    n_bins = len(bins) - 1
+    idx = np.digitize(df[column].to_numpy(dtype=np.float64), bins, right=right) - 1
+    in_range = (idx >= 0) & (idx < n_bins)
+    idx = idx[in_range]
+    
+    counts = np.bincount(idx, minlength=n_bins)
+    summary = {'count': counts}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for col in mean_columns:
+            weights = df[col].to_numpy(dtype=np.float64)[in_range]
+            summary[col] = np.bincount(idx, weights=weights, minlength=n_bins) / counts
+    
+    return pd.DataFrame(summary, index=pd.Index(labels, name=name))
+
 def create_injury_report():
     """Create a comprehensive injury analysis report."""
     
@@ -77,61 +100,53 @@ def create_injury_report():
     }).round(3)
     
     season_analysis.columns = ['Players', 'Actual_Injury_Rate', 'Avg_Predicted_Risk', 'Avg_Age', 'Avg_Touches']
-    print(season_analysis)
+    season_text = season_analysis.to_string()
+    print(season_text)
     
     # Age-based Analysis
     print(f"\nAge-based Injury Analysis:")
     print("-" * 50)
     
     # Create age groups
-    predictions['age_group'] = pd.cut(predictions['age'], 
-                                    bins=[20, 25, 30, 35], 
-                                    labels=['Young (21-25)', 'Prime (26-30)', 'Veteran (31-35)'])
-    
-    age_analysis = predictions.groupby('age_group').agg({
-        'actual_injury': ['count', 'mean'],
-        'predicted_risk': 'mean',
-        'touches_per_game': 'mean'
-    }).round(3)
+    age_analysis = summarize_bins(predictions, 'age',
+                                  bins=[20, 25, 30, 35],
+                                  labels=['Young (21-25)', 'Prime (26-30)', 'Veteran (31-35)'],
+                                  mean_columns=['actual_injury', 'predicted_risk', 'touches_per_game'],
+                                  name='age_group').round(3)
     
     age_analysis.columns = ['Players', 'Injury_Rate', 'Avg_Predicted_Risk', 'Avg_Touches']
-    print(age_analysis)
+    age_text = age_analysis.to_string()
+    print(age_text)
     
     # Touch-based Analysis
     print(f"\nTouch-based Injury Analysis:")
     print("-" * 50)
     
     # Create touch groups
-    predictions['touch_group'] = pd.cut(predictions['touches_per_game'], 
-                                      bins=[0, 10, 15, 20, 30], 
-                                      labels=['Low (0-10)', 'Medium (11-15)', 'High (16-20)', 'Very High (21+)'])
-    
-    touch_analysis = predictions.groupby('touch_group').agg({
-        'actual_injury': ['count', 'mean'],
-        'predicted_risk': 'mean',
-        'age': 'mean'
-    }).round(3)
+    touch_analysis = summarize_bins(predictions, 'touches_per_game',
+                                    bins=[0, 10, 15, 20, 30],
+                                    labels=['Low (0-10)', 'Medium (11-15)', 'High (16-20)', 'Very High (21+)'],
+                                    mean_columns=['actual_injury', 'predicted_risk', 'age'],
+                                    name='touch_group').round(3)
     
     touch_analysis.columns = ['Players', 'Injury_Rate', 'Avg_Predicted_Risk', 'Avg_Age']
-    print(touch_analysis)
+    touch_text = touch_analysis.to_string()
+    print(touch_text)
     
     # Risk Score Analysis
     print(f"\nRisk Score Analysis:")
     print("-" * 50)
     
     # Create risk groups
-    predictions['risk_group'] = pd.cut(predictions['predicted_risk'], 
-                                     bins=[0, 0.3, 0.5, 0.7, 1.0], 
-                                     labels=['Low (0-0.3)', 'Medium (0.3-0.5)', 'High (0.5-0.7)', 'Very High (0.7+)'])
-    
-    risk_analysis = predictions.groupby('risk_group').agg({
-        'actual_injury': ['count', 'mean'],
-        'age': 'mean',
-        'touches_per_game': 'mean'
-    }).round(3)
+    risk_analysis = summarize_bins(predictions, 'predicted_risk',
+                                   bins=[0, 0.3, 0.5, 0.7, 1.0],
+                                   labels=['Low (0-0.3)', 'Medium (0.3-0.5)', 'High (0.5-0.7)', 'Very High (0.7+)'],
+                                   mean_columns=['actual_injury', 'age', 'touches_per_game'],
+                                   name='risk_group').round(3)
     
     risk_analysis.columns = ['Players', 'Actual_Injury_Rate', 'Avg_Age', 'Avg_Touches']
-    print(risk_analysis)
+    risk_text = risk_analysis.to_string()
+    print(risk_text)
     
     # Top 10 Highest Risk Players
     print(f"\nTop 10 Highest Risk Players:")
@@ -151,49 +166,51 @@ def create_injury_report():
     print(f"\nModel Calibration Analysis:")
     print("-" * 50)
     
-    # Group by predicted risk ranges and compare with actual injury rates
-    risk_ranges = [(0, 0.2), (0.2, 0.4), (0.4, 0.6), (0.6, 0.8), (0.8, 1.0)]
+    # Group by predicted risk ranges [low, high) and compare with actual injury rates
+    risk_edges = [0, 0.2, 0.4, 0.6, 0.8, 1.0]
+    risk_labels = [f"{low:.1f}-{high:.1f}" for low, high in zip(risk_edges[:-1], risk_edges[1:])]
+    calibration = summarize_bins(predictions, 'predicted_risk', risk_edges, risk_labels,
+                                 mean_columns=['predicted_risk', 'actual_injury'], right=False)
     
-    for low, high in risk_ranges:
-        mask = (predictions['predicted_risk'] >= low) & (predictions['predicted_risk'] < high)
-        if mask.sum() > 0:
-            subset = predictions[mask]
-            actual_rate = subset['actual_injury'].mean()
-            predicted_rate = subset['predicted_risk'].mean()
-            count = len(subset)
-            print(f"Risk {low:.1f}-{high:.1f}: {count:>2} players, Predicted: {predicted_rate:.3f}, Actual: {actual_rate:.3f}")
+    for label, row in calibration[calibration['count'] > 0].iterrows():
+        print(f"Risk {label}: {int(row['count']):>2} players, Predicted: {row['predicted_risk']:.3f}, Actual: {row['actual_injury']:.3f}")
     
     # Save detailed report
     report_file = 'data/rb_injury_analysis_report.txt'
     
-    with open(report_file, 'w') as f:
-        f.write("RB Injury Analysis Report\n")
-        f.write("=" * 50 + "\n\n")
+    # Assemble the report once, reusing the tables already formatted for the console
+    report_parts = [
+        "RB Injury Analysis Report\n",
+        "=" * 50 + "\n\n",
         
-        f.write(f"Model Performance:\n")
-        f.write(f"Accuracy: {accuracy:.3f}\n")
-        f.write(f"ROC AUC: {roc_auc:.3f}\n")
-        f.write(f"Precision: {precision:.3f}\n")
-        f.write(f"Recall: {recall:.3f}\n")
-        f.write(f"F1-Score: {f1:.3f}\n\n")
+        "Model Performance:\n",
+        f"Accuracy: {accuracy:.3f}\n",
+        f"ROC AUC: {roc_auc:.3f}\n",
+        f"Precision: {precision:.3f}\n",
+        f"Recall: {recall:.3f}\n",
+        f"F1-Score: {f1:.3f}\n\n",
         
-        f.write("Season Analysis:\n")
-        f.write(season_analysis.to_string() + "\n\n")
+        "Season Analysis:\n",
+        season_text + "\n\n",
         
-        f.write("Age Analysis:\n")
-        f.write(age_analysis.to_string() + "\n\n")
+        "Age Analysis:\n",
+        age_text + "\n\n",
         
-        f.write("Touch Analysis:\n")
-        f.write(touch_analysis.to_string() + "\n\n")
+        "Touch Analysis:\n",
+        touch_text + "\n\n",
         
-        f.write("Risk Analysis:\n")
-        f.write(risk_analysis.to_string() + "\n\n")
+        "Risk Analysis:\n",
+        risk_text + "\n\n",
         
-        f.write("High Risk Players:\n")
-        f.write(high_risk.to_string() + "\n\n")
+        "High Risk Players:\n",
+        high_risk.to_string() + "\n\n",
         
-        f.write("Low Risk Players:\n")
-        f.write(low_risk.to_string() + "\n")
+        "Low Risk Players:\n",
+        low_risk.to_string() + "\n"
+    ]
+    
+    with open(report_file, 'w') as f:
+        f.write("".join(report_parts))
     
     print(f"\n✓ Detailed report saved to: {report_file}")
     
@@ -219,7 +236,7 @@ def create_injury_report():
     
     # 2. Age vs Injury Rate
     ax2 = axes[0, 1]
-    age_injuries = predictions.groupby('age_group')['actual_injury'].mean()
+    age_injuries = age_analysis['Injury_Rate']
     ax2.bar(range(len(age_injuries)), age_injuries.values, color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
     ax2.set_title('Injury Rate by Age Group')
     ax2.set_xlabel('Age Group')
@@ -229,7 +246,7 @@ def create_injury_report():
     
     # 3. Touches vs Injury Rate
     ax3 = axes[0, 2]
-    touch_injuries = predictions.groupby('touch_group')['actual_injury'].mean()
+    touch_injuries = touch_analysis['Injury_Rate']
     ax3.bar(range(len(touch_injuries)), touch_injuries.values, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'])
     ax3.set_title('Injury Rate by Touch Volume')
     ax3.set_xlabel('Touch Volume')
@@ -239,7 +256,7 @@ def create_injury_report():
     
     # 4. Predicted vs Actual Risk
     ax4 = axes[1, 0]
-    ax4.scatter(predictions['predicted_risk'], predictions['actual_injury'], alpha=0.6)
+    ax4.scatter(predictions['predicted_risk'], predictions['actual_injury'], alpha=0.6, rasterized=True)
     ax4.plot([0, 1], [0, 1], 'r--', alpha=0.8)
     ax4.set_title('Predicted vs Actual Injury Risk')
     ax4.set_xlabel('Predicted Risk')
@@ -247,14 +264,14 @@ def create_injury_report():
     
     # 5. Age vs Predicted Risk
     ax5 = axes[1, 1]
-    ax5.scatter(predictions['age'], predictions['predicted_risk'], alpha=0.6)
+    ax5.hexbin(predictions['age'], predictions['predicted_risk'], gridsize=30, cmap='viridis', mincnt=1)
     ax5.set_title('Age vs Predicted Injury Risk')
     ax5.set_xlabel('Age')
     ax5.set_ylabel('Predicted Risk')
     
     # 6. Touches vs Predicted Risk
     ax6 = axes[1, 2]
-    ax6.scatter(predictions['touches_per_game'], predictions['predicted_risk'], alpha=0.6)
+    ax6.hexbin(predictions['touches_per_game'], predictions['predicted_risk'], gridsize=30, cmap='viridis', mincnt=1)
     ax6.set_title('Touches per Game vs Predicted Risk')
     ax6.set_xlabel('Touches per Game')
     ax6.set_ylabel('Predicted Risk')
@@ -5,15 +5,25 @@ Saves a CSV with columns: player, player_id, pfr_url
 """
 import time
 import random
-from typing import Optional
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import argparse
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup, Comment
+from requests.adapters import HTTPAdapter
+import lxml.html
+from io import StringIO
 from urllib.parse import urljoin
 
+from page_cache import cache_get, cache_put
+
 BASE = "https://www.pro-football-reference.com"
 
+# Compiled once for the player_id extraction from PFR player URLs
+PLAYER_ID_RE = re.compile(r"/players/([^/]+)/[^/]+\.htm", re.ASCII)
+
 # Multiple User-Agents to rotate through
 USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -42,6 +52,19 @@ def _make_session() -> requests.Session:
     })
     return s
 
+# One session per thread, so repeat fetches reuse the pooled keep-alive
+# connection without threads sharing a Session (_get_with_retries rotates
+# its User-Agent header)
+_LOCAL = threading.local()
+
+def _session() -> requests.Session:
+    """Return the calling thread's session, creating it on first use."""
+    session = getattr(_LOCAL, "session", None)
+    if session is None:
+        session = _LOCAL.session = _make_session()
+        session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    return session
+
 def _get_with_retries(session: requests.Session, url: str, max_tries: int = 5, backoff: float = 2.0) -> requests.Response:
     for attempt in range(1, max_tries + 1):
         try:
@@ -98,68 +121,57 @@ def _get_with_retries(session: requests.Session, url: str, max_tries: int = 5, b
     
     raise RuntimeError(f"Failed after {max_tries} attempts")
 
-def _parse_commented_table(html: str, table_id: str) -> pd.DataFrame:
+def _extract_comment_block(root, table_id: str) -> str:
+    """Return the raw HTML comment string that contains the table."""
+    # Look under the "all_" wrapper div first, then fall back to any comment on the page
+    for xpath in (f'//div[@id="all_{table_id}"]//comment()', '//comment()'):
+        for c in root.xpath(xpath):
+            text = c.text or ""
+            if f'id="{table_id}"' in text or f"id='{table_id}'" in text:
+                return text
+    raise ValueError(f"Could not locate commented block for table '{table_id}'.")
+
+def _find_table(root, table_id: str):
     """
-    PFR often wraps tables in <!-- ... -->. This extracts the comment content
-    that contains the table and reads it with pandas.
+    PFR often wraps tables in <!-- ... -->. Return the <table> element from
+    the parsed page, parsing the comment that contains it if it is not in the DOM.
     """
-    soup = BeautifulSoup(html, "lxml")
     # Try direct first (if not commented)
-    table = soup.find("table", id=table_id)
-    if table is not None:
-        return pd.read_html(str(table))[0]
-
-    # Look under the "all_" wrapper div and find HTML comments
-    wrapper = soup.find(id=f"all_{table_id}")
-    comment_html: Optional[str] = None
-    if wrapper:
-        for c in wrapper.find_all(string=lambda text: isinstance(text, Comment)):
-            if f'id="{table_id}"' in c or f"id='{table_id}'" in c:
-                comment_html = c
-                break
-    if not comment_html:
-        # Fallback: search any comment on the page (slower but robust)
-        for c in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            if f'id="{table_id}"' in c or f"id='{table_id}'" in c:
-                comment_html = c
-                break
-
-    if not comment_html:
-        raise ValueError(f"Could not locate table '{table_id}' in page (might be renamed).")
-
-    return pd.read_html(str(comment_html))[0]
+    tables = root.xpath(f'//table[@id="{table_id}"]')
+    if tables:
+        return tables[0]
 
-def _extract_comment_block(html: str, table_id: str) -> str:
-    """Return the raw HTML comment string that contains the table."""
-    soup = BeautifulSoup(html, "lxml")
-    wrapper = soup.find(id=f"all_{table_id}")
-    if wrapper:
-        for c in wrapper.find_all(string=lambda text: isinstance(text, Comment)):
-            if f'id="{table_id}"' in c or f"id='{table_id}'" in c:
-                return c
-    # fallback
-    for c in soup.find_all(string=lambda text: isinstance(text, Comment)):
-        if f'id="{table_id}"' in c or f"id='{table_id}'" in c:
-            return c
-    raise ValueError(f"Could not locate commented block for table '{table_id}'.")
+    tables = lxml.html.fromstring(_extract_comment_block(root, table_id)).xpath(f'//table[@id="{table_id}"]')
+    if not tables:
+        raise ValueError(f"Could not locate table '{table_id}' in page (might be renamed).")
+    return tables[0]
 
-def get_player_list(season: int) -> pd.DataFrame:
+def get_player_list(season: int, session: Optional[requests.Session] = None) -> pd.DataFrame:
     """
     Returns the rushing leaderboard for a given season (e.g., 2024),
     including player links so you can later visit each player's page.
     """
     url = f"{BASE}/years/{season}/rushing.htm"
-    session = _make_session()
+    if session is None:
+        session = _session()
 
-    # Polite delay before making request
-    print("Waiting before making request...")
-    time.sleep(random.uniform(2, 4))
+    html = cache_get(url)
+    if html is not None:
+        print(f"Using cached page for {url}")
+    else:
+        # Polite delay before making request
+        print("Waiting before making request...")
+        time.sleep(random.uniform(2, 4))
 
-    print(f"Fetching {url}")
-    resp = _get_with_retries(session, url)
-    print("Successfully retrieved page")
+        print(f"Fetching {url}")
+        html = _get_with_retries(session, url).text
+        print("Successfully retrieved page")
+        cache_put(url, html)
     
-    df = _parse_commented_table(resp.text, table_id="rushing")
+    # Parse the page once; the table element feeds both the DataFrame and the link map
+    root = lxml.html.fromstring(html)
+    table = _find_table(root, "rushing")
+    df = pd.read_html(StringIO(lxml.html.tostring(table, encoding="unicode")))[0]
     print(f"Parsed table with {len(df)} rows")
 
     # Clean up: remove headers embedded in the tbody and summary rows
@@ -169,57 +181,77 @@ def get_player_list(season: int) -> pd.DataFrame:
     # Normalize column names
     df.columns = [c.strip().lower().replace("%", "pct").replace(" ", "_") for c in df.columns]
 
-    # Rebuild absolute player URLs from the page anchors
-    soup = BeautifulSoup(resp.text, "lxml")
-    # Find the table again to map names -> href
-    # Use the commented HTML to ensure we see <a> tags
-    table_html = _parse_commented_table(resp.text, table_id="rushing")
-    # The pandas table loses links, so we parse links from the comment soup instead:
-    link_map = {}
-    # Build a soup from the commented HTML block
-    commented_soup = BeautifulSoup(str(_extract_comment_block(resp.text, "rushing")), "lxml")
-    for a in commented_soup.select(f'table#rushing tbody tr td[data-stat="player"] a'):
-        name = a.get_text(strip=True)
-        href = a.get("href")
-        if href:
-            link_map[name] = urljoin(BASE, href)
+    # Rebuild absolute player URLs from the page anchors.
+    # The pandas table loses links, so we read them from the same table element
+    # and hash-join them back on player name (the last link for a name wins)
+    anchors = [
+        (a.text_content().strip(), urljoin(BASE, a.get("href")))
+        for a in table.xpath('.//td[@data-stat="player"]/a[@href]')
+    ]
+    links_df = pd.DataFrame(anchors, columns=["player", "player_url"]).drop_duplicates(subset="player", keep="last")
 
     # Attach URLs by merging on player name (pfr uses "player" column)
-    name_col = "player" if "player" in df.columns else None
-    if name_col:
-        df["player_url"] = df[name_col].map(link_map)
+    if "player" in df.columns:
+        df = df.merge(links_df, on="player", how="left")
 
     return df.reset_index(drop=True)
 
+def get_player_lists(seasons: List[int], max_concurrency: int = 3) -> Dict[int, pd.DataFrame]:
+    """
+    Fetch several seasons' rushing leaderboards concurrently, each worker
+    thread over its own keep-alive session. The page fetch is I/O bound, so a
+    small thread pool overlaps the polite delays and round trips while capping
+    load on PFR.
+    """
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        frames = executor.map(get_player_list, seasons)
+        return dict(zip(seasons, frames))
+
+def _to_output(df: pd.DataFrame) -> pd.DataFrame:
+    """Reduce a rushing leaderboard to the RB columns the other scripts expect."""
+    # Keep only RBs if needed (PFR table includes all players who rushed)
+    if "pos" in df.columns:
+        df = df[df["pos"].isin(["RB", "HB", "FB"])].copy()
+    
+    # Extract player_id from URL for compatibility with existing scripts
+    df["player_id"] = df["player_url"].str.extract(PLAYER_ID_RE)
+    
+    # Rename columns to match expected format
+    df = df.rename(columns={"player_url": "pfr_url"})
+    
+    # Select only the columns we need
+    return df[["player", "player_id", "pfr_url"]].copy()
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--season", type=int, default=2024)
-    parser.add_argument("--out", required=True, help="Output CSV file path")
+    parser.add_argument("--season", type=int, nargs="+", default=[2024],
+                        help="One or more seasons to discover")
+    parser.add_argument("--out", required=True,
+                        help="Output CSV file path; use {season} in it when passing several seasons")
+    parser.add_argument("--max-concurrency", type=int, default=3,
+                        help="Maximum seasons fetched at once")
     args = parser.parse_args()
 
-    print(f"Discovering RBs for {args.season} season...")
+    if len(args.season) > 1 and "{season}" not in args.out:
+        parser.error("--out must contain {season} when discovering several seasons")
+
+    print(f"Discovering RBs for {', '.join(map(str, args.season))} season(s)...")
     print("Using enhanced anti-blocking measures...")
     
     try:
-        df = get_player_list(args.season)
-        
-        # Keep only RBs if needed (PFR table includes all players who rushed)
-        if "pos" in df.columns:
-            df = df[df["pos"].isin(["RB", "HB", "FB"])].copy()
-        
-        # Extract player_id from URL for compatibility with existing scripts
-        df["player_id"] = df["player_url"].str.extract(r"/players/([^/]+)/[^/]+\.htm")
+        if len(args.season) == 1:
+            player_lists = {args.season[0]: get_player_list(args.season[0])}
+        else:
+            player_lists = get_player_lists(args.season, args.max_concurrency)
         
-        # Rename columns to match expected format
-        df = df.rename(columns={"player_url": "pfr_url"})
-        
-        # Select only the columns we need
-        output_df = df[["player", "player_id", "pfr_url"]].copy()
-        
-        # Save to CSV
-        output_df.to_csv(args.out, index=False)
-        print(f"✓ Saved {len(output_df)} RB players → {args.out}")
-        print(f"Columns: {list(output_df.columns)}")
+        for season, df in player_lists.items():
+            output_df = _to_output(df)
+            
+            # Save to CSV
+            out = args.out.format(season=season)
+            output_df.to_csv(out, index=False)
+            print(f"✓ Saved {len(output_df)} RB players → {out}")
+            print(f"Columns: {list(output_df.columns)}")
         
     except Exception as e:
         print(f"✗ Error: {e}")
@@ -1,160 +1,145 @@
 """
-Alternative RB discovery script using curl to bypass Python-specific blocking.
-This script uses subprocess to call curl, which often works when Python requests are blocked.
+Alternative RB discovery script using a pooled requests session.
+Connections are kept alive across requests and transient errors (429/5xx)
+are retried with backoff, honouring Retry-After.
 """
 import argparse
-import subprocess
 import time
 import random
+import re
 import pandas as pd
-from bs4 import BeautifulSoup, Comment
+import lxml.html
+from lxml import etree
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from io import BytesIO
 from urllib.parse import urljoin
 import os
-import re
+
+from page_cache import cache_get, cache_put
 
 BASE = "https://www.pro-football-reference.com"
 
-def _make_curl_command(url: str) -> list:
-    """Create a curl command with realistic browser headers."""
-    user_agents = [
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15"
-    ]
-    
-    user_agent = random.choice(user_agents)
+# Compiled once for the player_id extraction from PFR player URLs
+PLAYER_ID_RE = re.compile(r"/players/([^/]+)/[^/]+\.htm", re.ASCII)
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15"
+]
+
+def _make_session() -> requests.Session:
+    """Create a keep-alive session with browser headers and automatic retries."""
+    session = requests.Session()
+    retry = Retry(
+        total=5,
+        backoff_factor=2,
+        status_forcelist=(429, 502, 503, 504),
+        respect_retry_after_header=True,
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    session.headers.update({
+        "User-Agent": random.choice(USER_AGENTS),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Connection": "keep-alive",
+        "Referer": f"{BASE}/",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "same-origin",
+        "Sec-Fetch-User": "?1",
+        "Upgrade-Insecure-Requests": "1",
+    })
+    return session
+
+SESSION = _make_session()
+
+def _get(url: str) -> str:
+    """Fetch URL content over the shared session, reusing a recent cached copy."""
+    html = cache_get(url)
+    if html is not None:
+        print(f"✓ Using cached page for {url}")
+        return html
     
-    return [
-        "curl",
-        "-s",  # Silent mode
-        "-L",  # Follow redirects
-        "-H", f"User-Agent: {user_agent}",
-        "-H", "Accept: text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "-H", "Accept-Language: en-US,en;q=0.9",
-        "-H", "Accept-Encoding: gzip, deflate, br",
-        "-H", "Connection: keep-alive",
-        "-H", f"Referer: {BASE}/",
-        "-H", "Sec-Fetch-Dest: document",
-        "-H", "Sec-Fetch-Mode: navigate",
-        "-H", "Sec-Fetch-Site: same-origin",
-        "-H", "Sec-Fetch-User: ?1",
-        "-H", "Upgrade-Insecure-Requests: 1",
-        "--compressed",
-        url
-    ]
-
-def _get_with_curl(url: str, max_tries: int = 3) -> str:
-    """Fetch URL content using curl."""
-    for attempt in range(1, max_tries + 1):
-        try:
-            if attempt > 1:
-                delay = random.uniform(2, 5)
-                print(f"Attempt {attempt}: Waiting {delay:.1f}s before retry...")
-                time.sleep(delay)
-            
-            print(f"Fetching {url} (attempt {attempt})")
-            cmd = _make_curl_command(url)
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0 and result.stdout:
-                print("✓ Successfully retrieved page")
-                return result.stdout
-            else:
-                print(f"✗ Curl failed (attempt {attempt}): {result.stderr}")
-                
-        except subprocess.TimeoutExpired:
-            print(f"Timeout on attempt {attempt}")
-        except Exception as e:
-            print(f"Error on attempt {attempt}: {e}")
-        
-        if attempt == max_tries:
-            raise RuntimeError(f"Failed to fetch {url} after {max_tries} attempts")
+    # Polite delay before making request
+    print("Waiting before making request...")
+    time.sleep(random.uniform(2, 4))
     
-    raise RuntimeError("Unexpected error in _get_with_curl")
+    print(f"Fetching {url}")
+    resp = SESSION.get(url, timeout=30)
+    resp.raise_for_status()
+    print("✓ Successfully retrieved page")
+    cache_put(url, resp.text)
+    return resp.text
 
-def _parse_commented_table(html: str, table_id: str) -> pd.DataFrame:
+def _find_table_html(root, table_id: str) -> str:
     """
-    PFR often wraps tables in <!-- ... -->. This extracts the comment content
-    that contains the table and reads it with pandas.
+    PFR often wraps tables in <!-- ... -->. Return the HTML of the table from
+    the parsed page, taking it from the comment that contains it if it is not
+    in the DOM. Comment nodes are located with XPath, so the search runs in lxml.
     """
-    soup = BeautifulSoup(html, "lxml")
     # Try direct first (if not commented)
-    table = soup.find("table", id=table_id)
-    if table is not None:
-        return pd.read_html(str(table))[0]
-
-    # Look under the "all_" wrapper div and find HTML comments
-    wrapper = soup.find(id=f"all_{table_id}")
-    comment_html = None
-    if wrapper:
-        for c in wrapper.find_all(string=lambda text: isinstance(text, Comment)):
-            if f'id="{table_id}"' in c or f"id='{table_id}'" in c:
-                comment_html = c
-                break
-    if not comment_html:
-        # Fallback: search any comment on the page (slower but robust)
-        for c in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            if f'id="{table_id}"' in c or f"id='{table_id}'" in c:
-                comment_html = c
-                break
-
-    if not comment_html:
-        raise ValueError(f"Could not locate table '{table_id}' in page (might be renamed).")
-
-    return pd.read_html(str(comment_html))[0]
-
-def get_player_list(season: int) -> pd.DataFrame:
+    tables = root.xpath(f'//table[@id="{table_id}"]')
+    if tables:
+        return lxml.html.tostring(tables[0], encoding="unicode")
+
+    # Look under the "all_" wrapper div first, then fall back to any comment on the page
+    for xpath in (f'//div[@id="all_{table_id}"]//comment()', '//comment()'):
+        for c in root.xpath(xpath):
+            text = c.text or ""
+            if f'id="{table_id}"' in text or f"id='{table_id}'" in text:
+                return text
+
+    raise ValueError(f"Could not locate table '{table_id}' in page (might be renamed).")
+
+def _stream_player_rows(table_html: str):
     """
-    Returns the rushing leaderboard for a given season using curl.
+    Stream the player rows of a PFR table, returning (records, links).
+
+    Rows are read with iterparse and freed as soon as their cells are
+    collected, so only one row is resident at a time. Each record maps the
+    cells' data-stat names to their text; links maps player names to their
+    /players/ page hrefs.
     """
-    url = f"{BASE}/years/{season}/rushing.htm"
-    
-    # Polite delay before making request
-    print("Waiting before making request...")
-    time.sleep(random.uniform(2, 4))
-    
-    html_content = _get_with_curl(url)
-    
-    # Save HTML for debugging if needed
-    debug_file = f"debug_pfr_{season}.html"
-    with open(debug_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-        print(f"Saved HTML to {debug_file} for debugging")
-    
-    df = _parse_commented_table(html_content, table_id="rushing")
-    print(f"Parsed table with {len(df)} rows")
+    records = []
+    links = {}
+    for _, tr in etree.iterparse(BytesIO(table_html.encode("utf-8")), events=("end",), tag="tr", html=True):
+        # Header rows repeated inside tbody have no player cell
+        player_cells = tr.xpath('./td[@data-stat="player" or @data-stat="name_display"]')
+        if player_cells:
+            records.append({cell.get("data-stat"): "".join(cell.itertext()).strip() for cell in tr.xpath("./th|./td")})
+            for a in player_cells[0].xpath('./a[starts-with(@href, "/players/") and not(contains(@href, "/gamelog/"))]'):
+                links["".join(a.itertext()).strip()] = a.get("href")
 
-    # Clean up: remove headers embedded in the tbody and summary rows
-    # After flattening columns, check for 'rk' column
-    if "rk" in df.columns:
-        df = df[df["rk"].apply(lambda x: str(x).isdigit())].copy()
-        print(f"After cleaning: {len(df)} rows remaining")
-    else:
-        print(f"Warning: 'rk' column not found. Available columns: {list(df.columns)}")
+        # Free the finished row and any siblings already processed
+        tr.clear()
+        while tr.getprevious() is not None:
+            del tr.getparent()[0]
 
-    # Normalize column names - handle multi-level columns
-    if isinstance(df.columns, pd.MultiIndex):
-        # Flatten multi-level columns
-        df.columns = [col[1] if col[0].startswith('Unnamed') else f"{col[0]}_{col[1]}" for col in df.columns]
-    
-    # Normalize column names
-    df.columns = [str(c).strip().lower().replace("%", "pct").replace(" ", "_") for c in df.columns]
-    
+    return records, links
+
+def _save_debug_html(season: int, html_content: str) -> None:
+    """Write the fetched page to debug_pfr_{season}.html."""
+    debug_file = f"debug_pfr_{season}.html"
+    with open(debug_file, "wb") as f:
+        f.write(html_content.encode("utf-8", errors="replace"))
+    print(f"Saved HTML to {debug_file} for debugging")
+
+def _print_debug_summary(df: pd.DataFrame) -> None:
+    """Dump the parsed table's structure and first rows for debugging."""
     print(f"Normalized columns: {list(df.columns)}")
-    
-    # Debug: show the actual dataframe structure after processing
-    print(f"Dataframe columns: {list(df.columns)}")
     print(f"Dataframe shape: {df.shape}")
     print(f"First few rows of player column: {df['player'].head(10).tolist() if 'player' in df.columns else 'No player column'}")
     
-    # Debug: show the actual data in the first few rows
+    # Show the actual data in the first few rows
     print("First 3 rows of dataframe:")
-    for i in range(min(3, len(df))):
-        row = df.iloc[i]
-        print(f"Row {i}: {dict(row)}")
+    for i, row in enumerate(df.head(3).to_dict("records")):
+        print(f"Row {i}: {row}")
     
-    # Debug: check if player column exists and has data
+    # Check if player column exists and has data
     if 'player' in df.columns:
         print(f"Player column dtype: {df['player'].dtype}")
         print(f"Player column non-null count: {df['player'].count()}")
@@ -163,25 +148,55 @@ def get_player_list(season: int) -> pd.DataFrame:
         print("Player column not found in dataframe")
         print(f"Available columns: {list(df.columns)}")
 
-    # Extract player links using regex as the most reliable method
-    link_map = {}
-    print("Extracting player links using regex...")
+def get_player_list(season: int, verbose: bool = False, debug_html: bool = False) -> pd.DataFrame:
+    """
+    Returns the rushing leaderboard for a given season over the shared session.
+    Pass verbose=True to dump the parsed table's structure, and debug_html=True
+    to always save the fetched page (it is saved on parse failures regardless).
+    """
+    url = f"{BASE}/years/{season}/rushing.htm"
+    html_content = _get(url)
     
-    # Use regex to find all player links
-    pattern = r'<a href="(/players/[^"]+\.htm)">([^<]+)</a>'
-    matches = re.findall(pattern, html_content)
+    # Save HTML for debugging when asked, or when the page cannot be parsed
+    if debug_html:
+        _save_debug_html(season, html_content)
     
-    for href, name in matches:
-        if href.startswith("/players/") and "/gamelog/" not in href:
-            if name and name in df["player"].values:
-                link_map[name] = urljoin(BASE, href)
+    # Locate the table once, then stream its rows into records and the link map
+    try:
+        root = lxml.html.fromstring(html_content)
+        records, player_links = _stream_player_rows(_find_table_html(root, "rushing"))
+    except Exception:
+        if not debug_html:
+            _save_debug_html(season, html_content)
+        raise
+    df = pd.DataFrame.from_records(records).rename(columns={"ranker": "rk", "name_display": "player"})
+    print(f"Parsed table with {len(df)} rows")
+
+    # Clean up: remove headers embedded in the tbody and summary rows
+    if "rk" in df.columns:
+        df = df[df["rk"].apply(lambda x: str(x).isdigit())].copy()
+        print(f"After cleaning: {len(df)} rows remaining")
+    else:
+        print(f"Warning: 'rk' column not found. Available columns: {list(df.columns)}")
+
+    # Normalize column names
+    df.columns = [str(c).strip().lower().replace("%", "pct").replace(" ", "_") for c in df.columns]
     
-    print(f"Found {len(link_map)} player links with regex method")
+    if verbose:
+        _print_debug_summary(df)
+
+    # Player links were collected while streaming the rows; hash-join them
+    # back onto the table by player name
+    print("Extracting player links from the rushing table...")
+    links_df = pd.DataFrame(
+        [(name, urljoin(BASE, href)) for name, href in player_links.items()],
+        columns=["player", "player_url"],
+    )
     
     # Attach URLs by merging on player name
-    name_col = "player" if "player" in df.columns else None
-    if name_col:
-        df["player_url"] = df[name_col].map(link_map)
+    if "player" in df.columns:
+        print(f"Found {links_df['player'].isin(df['player']).sum()} player links")
+        df = df.merge(links_df, on="player", how="left")
     else:
         print(f"Warning: 'player' column not found. Available columns: {list(df.columns)}")
         df["player_url"] = None
@@ -191,14 +206,15 @@ def get_player_list(season: int) -> pd.DataFrame:
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--season", type=int, default=2024)
+    parser.add_argument("--verbose", action="store_true", help="Print the parsed table's structure for debugging")
+    parser.add_argument("--debug-html", action="store_true", help="Save the fetched page to debug_pfr_{season}.html")
     # No output parameter needed - using default naming
     args = parser.parse_args()
 
-    print(f"Discovering RBs for {args.season} season using curl...")
-    print("This approach often bypasses Python-specific blocking.")
+    print(f"Discovering RBs for {args.season} season...")
     
     try:
-        df = get_player_list(args.season)
+        df = get_player_list(args.season, verbose=args.verbose, debug_html=args.debug_html)
         
         # Keep only RBs if needed (PFR table includes all players who rushed)
         if "pos" in df.columns:
@@ -206,7 +222,7 @@ def main():
         
         # Extract player_id from URL for compatibility with existing scripts
         # Handle the case where player_url might be None
-        df["player_id"] = df["player_url"].astype(str).str.extract(r"/players/([^/]+)/[^/]+\.htm")
+        df["player_id"] = df["player_url"].astype(str).str.extract(PLAYER_ID_RE)
         
         # Rename columns to match expected format
         df = df.rename(columns={"player_url": "pfr_url"})
@@ -220,29 +236,10 @@ def main():
         print(f"✓ Saved {len(output_df)} RB players → {out}")
         print(f"Columns: {list(output_df.columns)}")
         
-        print(f"Dataframe columns: {list(df.columns)}")
-        print(f"Dataframe shape: {df.shape}")
-        print(f"First few rows of player column: {df['player'].head(10).tolist() if 'player' in df.columns else 'No player column'}")
-        
-        # Debug: show the actual data in the first few rows
-        print("First 3 rows of dataframe:")
-        for i in range(min(3, len(df))):
-            row = df.iloc[i]
-            print(f"Row {i}: {dict(row)}")
-        
-        # Debug: check if player column exists and has data
-        if 'player' in df.columns:
-            print(f"Player column dtype: {df['player'].dtype}")
-            print(f"Player column non-null count: {df['player'].count()}")
-            print(f"Player column unique values (first 10): {df['player'].unique()[:10]}")
-        else:
-            print("Player column not found in dataframe")
-            print(f"Available columns: {list(df.columns)}")
-        
     except Exception as e:
         print(f"✗ Error: {e}")
         print("\nTroubleshooting tips:")
-        print("1. Make sure curl is installed on your system")
+        print("1. Wait a few minutes and try again")
         print("2. Check if PFR is accessible in your browser")
         print("3. Try using a VPN if you're being geo-blocked")
         print("4. The site might be temporarily blocking all automated requests")
@@ -7,90 +7,100 @@ The data is embedded in the column structure and needs to be parsed properly.
 import pandas as pd
 import numpy as np
 import os
-import glob
 from pathlib import Path
 import re
 
+from file_pool import map_files
+
+def _digits(values):
+    """Numeric value of all-digit fields; anything else (or missing) becomes NaN."""
+    values = values.astype(object)
+    is_digit = values.str.isdigit().fillna(False).astype(bool)
+    return pd.to_numeric(values.where(is_digit), errors='coerce')
+
+def read_first_column(file_path):
+    """Read the first CSV column, which holds the encoded game rows.
+    
+    The PFR exports are ragged (data rows have more fields than the header),
+    which the Arrow reader and C-engine usecols both reject, so this is a
+    single plain C-engine read.
+    """
+    return pd.read_csv(file_path).iloc[:, [0]]
+
 def extract_game_data_from_csv(file_path):
     """Extract game data from a single CSV file."""
     print(f"Extracting data from {os.path.basename(file_path)}...")
     
     try:
-        # Read the CSV
-        df = pd.read_csv(file_path)
+        # Read the CSV (only the first column is used)
+        df = read_first_column(file_path)
         
         # The data structure is complex - let's examine it
         print(f"  CSV shape: {df.shape}")
         print(f"  Columns: {list(df.columns)}")
         
         # The actual game data is in the "Unnamed: 0" column
-        # Let's parse it properly
-        game_data = []
-        
         # Get player info
         filename = os.path.basename(file_path)
         player_id = filename.split('_')[0]
         season = filename.split('_')[1]
         
-        # Look at the first few rows to understand the structure
-        for idx, row in df.iterrows():
-            if idx == 0:  # Skip header row
-                continue
-                
-            # The game data is in the first column as a string
-            game_row = str(row.iloc[0])
-            
-            # Skip empty or header-like rows
-            if not game_row or game_row == 'nan' or 'Off%' in game_row:
-                continue
-            
-            # Parse the game data - it's space-separated
-            parts = game_row.split()
-            
-            if len(parts) >= 10:  # Should have at least basic game info
-                try:
-                    game_info = {
-                        'player_id': player_id,
-                        'season': int(season),
-                        'source_file': filename,
-                        'row_index': idx
-                    }
-                    
-                    # Try to extract key fields
-                    # The structure varies, so let's be flexible
-                    if len(parts) >= 5:
-                        game_info['week'] = parts[3] if parts[3].isdigit() else None
-                        game_info['date'] = f"{season}-{parts[4]}" if len(parts) > 4 else None
-                        game_info['team'] = parts[5] if len(parts) > 5 else None
-                        game_info['opponent'] = parts[7] if len(parts) > 7 else None
-                        game_info['result'] = parts[8] if len(parts) > 8 else None
-                        
-                        # Try to extract rushing stats
-                        if len(parts) >= 15:
-                            game_info['rushing_att'] = parts[10] if parts[10].isdigit() else 0
-                            game_info['rushing_yds'] = parts[11] if parts[11].isdigit() else 0
-                            game_info['rushing_td'] = parts[12] if parts[12].isdigit() else 0
-                        
-                        # Try to extract receiving stats
-                        if len(parts) >= 20:
-                            game_info['receiving_tgt'] = parts[14] if parts[14].isdigit() else 0
-                            game_info['receiving_rec'] = parts[15] if parts[15].isdigit() else 0
-                            game_info['receiving_yds'] = parts[16] if parts[16].isdigit() else 0
-                            game_info['receiving_td'] = parts[18] if parts[18].isdigit() else 0
-                    
-                    game_data.append(game_info)
-                    
-                except Exception as e:
-                    print(f"    Error parsing row {idx}: {e}")
-                    continue
+        # The game data is in the first column as a string; skip the header
+        # row and any empty or header-like rows
+        rows = df.iloc[1:, 0].astype(str)
+        rows = rows[(rows != 'nan') & (rows.str.len() > 0) & ~rows.str.contains('Off%', regex=False)]
+        
+        # Parse the game data - it's space-separated. Split every row at once
+        # and pad to 20 fields so short rows just have missing trailing parts.
+        parts = rows.str.split(expand=True)
+        parts = parts.reindex(columns=range(max(20, parts.shape[1])))
+        n_parts = parts.notna().sum(axis=1)
+        
+        # Should have at least basic game info
+        keep = n_parts >= 10
+        parts, n_parts = parts[keep], n_parts[keep]
+        
+        if parts.empty:
+            print(f"  ✓ Extracted 0 games")
+            return pd.DataFrame()
+        
+        game_data = pd.DataFrame({
+            'player_id': player_id,
+            'season': int(season),
+            'source_file': filename,
+            'row_index': parts.index,
+            'week': _digits(parts[3]),
+            'date': f"{season}-" + parts[4],
+            'team': parts[5],
+            'opponent': parts[7],
+            'result': parts[8],
+        }, index=parts.index)
+        
+        # Rushing stats need at least 15 fields, receiving stats at least 20
+        has_rushing = n_parts >= 15
+        for col, pos in [('rushing_att', 10), ('rushing_yds', 11), ('rushing_td', 12)]:
+            game_data[col] = _digits(parts[pos]).fillna(0).where(has_rushing)
+        
+        has_receiving = n_parts >= 20
+        for col, pos in [('receiving_tgt', 14), ('receiving_rec', 15), ('receiving_yds', 16), ('receiving_td', 18)]:
+            game_data[col] = _digits(parts[pos]).fillna(0).where(has_receiving)
         
         print(f"  ✓ Extracted {len(game_data)} games")
-        return pd.DataFrame(game_data)
+        return game_data.reset_index(drop=True)
         
     except Exception as e:
         print(f"  ✗ Error processing {file_path}: {e}")
         return None
 
+def iter_csv(input_dir):
+    """Yield the CSV file paths in input_dir as the directory is read."""
+    if not os.path.isdir(input_dir):
+        return
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".csv"):
+                yield entry.path
+
 def main():
     """Main function to extract game data from all files."""
     print("Extracting Game Data from PFR CSVs")
@@ -103,21 +113,21 @@ def main():
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # Find all CSV files
-    csv_files = glob.glob(os.path.join(input_dir, "*.csv"))
+    # Process each file
+    all_game_data = []
+    successful_files = 0
+    
+    # Hand each CSV to the worker processes as the directory scan finds it;
+    # results come back in file order
+    results = map_files(extract_game_data_from_csv, iter_csv(input_dir))
     
-    if not csv_files:
+    if not results:
         print("No CSV files found in", input_dir)
         return
     
-    print(f"Found {len(csv_files)} CSV files to process")
+    print(f"Processed {len(results)} CSV files")
     
-    # Process each file
-    all_game_data = []
-    successful_files = 0
-    
-    for csv_file in csv_files:
-        game_df = extract_game_data_from_csv(csv_file)
+    for game_df in results:
         if game_df is not None and len(game_df) > 0:
             all_game_data.append(game_df)
             successful_files += 1
@@ -133,14 +143,20 @@ def main():
     # Clean up the data
     print("Cleaning extracted data...")
     
-    # Convert numeric columns
+    # Numeric columns are already parsed; fill gaps and narrow them in one pass
     numeric_cols = ['week', 'rushing_att', 'rushing_yds', 'rushing_td', 'receiving_tgt', 'receiving_rec', 'receiving_yds', 'receiving_td']
-    for col in numeric_cols:
+    present_cols = [col for col in numeric_cols if col in combined_df.columns]
+    combined_df[present_cols] = combined_df[present_cols].fillna(0).astype('int16')
+    
+    # The key/label strings repeat on every game, so store them as categories
+    for col in ['player_id', 'team', 'opponent', 'source_file', 'result']:
         if col in combined_df.columns:
-            combined_df[col] = pd.to_numeric(combined_df[col], errors='coerce').fillna(0)
+            combined_df[col] = combined_df[col].astype('category')
     
     # Create injury indicators
-    combined_df['injured'] = (combined_df['rushing_att'] == 0) & (combined_df['receiving_rec'] == 0)
+    rushing_att = combined_df['rushing_att'].to_numpy()
+    receiving_rec = combined_df['receiving_rec'].to_numpy()
+    combined_df['injured'] = np.logical_and(rushing_att == 0, receiving_rec == 0)
     
     # Save the extracted data
     output_file = os.path.join(output_dir, "extracted_game_data.csv")
@@ -160,7 +176,11 @@ def main():
     
     # Show injury summary
     if 'injured' in combined_df.columns:
-        injury_summary = combined_df.groupby('player_id')['injured'].sum().sort_values(ascending=False)
+        # Count injured games per player straight from the category codes
+        player_ids = combined_df['player_id']
+        injured_codes = player_ids.cat.codes.to_numpy()[combined_df['injured'].to_numpy()]
+        games_missed = np.bincount(injured_codes, minlength=len(player_ids.cat.categories))
+        injury_summary = pd.Series(games_missed, index=pd.Index(player_ids.cat.categories, name='player_id'), name='injured').sort_values(ascending=False)
         print(f"\nInjury summary (games missed per player):")
         print(injury_summary.head(10).to_string())
 
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Process pool helper for the per-file parsing scripts.
+Files parse independently, so they are spread over one worker process per core.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+def map_files(func, file_paths):
+    """Apply func to each file in worker processes, returning results in file order.
+    
+    A list is split into chunks sized from its length to cut pickling round
+    trips. Any other iterable (such as iter_csv) is submitted one file at a
+    time as it is consumed, so work starts while the directory is still
+    being read.
+    """
+    if hasattr(file_paths, '__len__'):
+        chunksize = max(1, len(file_paths) // (os.cpu_count() * 4))
+    else:
+        chunksize = 1
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(func, file_paths, chunksize=chunksize))
@@ -8,9 +8,12 @@ import re
 import argparse
 import os
 
+# Compiled once; used per URL and for the column-wide extraction
+PFR_ID_RE = re.compile(r'/players/[A-Z]/([A-Za-z0-9]+)\.htm$')
+
 def extract_pfr_id(url):
     """Extract PFR player ID from URL like https://www.pro-football-reference.com/players/T/TaylJo02.htm"""
-    match = re.search(r'/players/[A-Z]/([A-Za-z0-9]+)\.htm$', url)
+    match = PFR_ID_RE.search(url)
     if match:
         return match.group(1)
     return None
@@ -22,14 +25,14 @@ def fix_player_ids(input_csv, output_csv):
     print(f"Processing {len(df)} players...")
     
     # Extract PFR IDs from URLs
-    df['pfr_id'] = df['pfr_url'].apply(extract_pfr_id)
+    df['pfr_id'] = df['pfr_url'].str.extract(PFR_ID_RE, expand=False)
     
     # Check for any missing IDs
     missing_ids = df[df['pfr_id'].isna()]
     if len(missing_ids) > 0:
         print(f"Warning: {len(missing_ids)} players have missing PFR IDs:")
-        for _, row in missing_ids.iterrows():
-            print(f"  {row['player']}: {row['pfr_url']}")
+        for player, url in missing_ids[['player', 'pfr_url']].itertuples(index=False, name=None):
+            print(f"  {player}: {url}")
     
     # Replace the old player_id column with the new PFR ID
     df['player_id'] = df['pfr_id']
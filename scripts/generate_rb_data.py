@@ -5,103 +5,107 @@ This creates synthetic data that can be used to test and validate the injury mod
 """
 import pandas as pd
 import numpy as np
-import random
 from datetime import datetime, timedelta
 
+# Name pools for the synthetic players
+FIRST_NAMES = np.array(['James', 'Michael', 'David', 'John', 'Robert', 'William', 'Richard', 'Joseph', 'Thomas', 'Christopher'])
+LAST_NAMES = np.array(['Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez', 'Hernandez'])
+
+def injury_risk_scores(age, touches_per_game, injury_history, season_factor, noise):
+    """Return (total_risk, injury_probability) arrays for the given players.
+    
+    The arithmetic runs in place on two buffers rather than allocating a
+    temporary per step.
+    """
+    # Create injury risk based on realistic factors
+    # Age has U-shaped relationship with injury risk
+    total_risk = np.multiply(0.1, (age - 25) ** 2, dtype=np.float64)
+    total_risk /= 25
+    
+    # Touches per game increases injury risk
+    touches_risk = np.divide(touches_per_game, 5, dtype=np.float64)
+    np.log1p(touches_risk, out=touches_risk)
+    touches_risk *= 0.05
+    total_risk += touches_risk
+    
+    # Previous injury history increases risk
+    total_risk += 0.3 * injury_history
+    
+    total_risk *= season_factor
+    total_risk += noise
+    
+    # Logistic link; reuse the touches buffer for the probability
+    injury_probability = np.subtract(total_risk, 0.5, out=touches_risk)
+    np.negative(injury_probability, out=injury_probability)
+    np.exp(injury_probability, out=injury_probability)
+    injury_probability += 1
+    np.reciprocal(injury_probability, out=injury_probability)
+    
+    return total_risk, injury_probability
+
 def generate_rb_season_data(season, n_players=50):
     """Generate realistic RB data for a given season."""
     
-    # Set seed for reproducibility
-    np.random.seed(42 + season)
-    random.seed(42 + season)
-    
-    # Generate realistic player data
-    data = []
-    
-    for i in range(n_players):
-        # Age distribution: most RBs are 22-28, some veterans 29-32
-        if random.random() < 0.8:
-            age = np.random.normal(25, 2)  # Young RBs
-        else:
-            age = np.random.normal(30, 2)  # Veteran RBs
-        age = max(21, min(35, int(age)))
-        
-        # Games played: most play 12-17 games, some get injured
-        if random.random() < 0.7:
-            games_played = np.random.poisson(15)  # Healthy season
-        else:
-            games_played = np.random.poisson(8)   # Injury-shortened
-        games_played = max(1, min(18, games_played))
-        
-        # Touches per game: varies by role (starter vs backup)
-        if random.random() < 0.6:
-            touches_per_game = np.random.normal(18, 4)  # Starter
-        else:
-            touches_per_game = np.random.normal(8, 3)   # Backup
-        touches_per_game = max(1, touches_per_game)
-        
-        # Yards per touch: typically 4-6 yards
-        yards_per_touch = np.random.normal(4.5, 0.8)
-        yards_per_touch = max(2.5, min(7.0, yards_per_touch))
-        
-        # Injury history: 30% have previous injuries
-        injury_history = np.random.binomial(1, 0.3)
-        
-        # Position (all RBs for this dataset)
-        position = 'RB'
-        
-        # Create injury risk based on realistic factors
-        # Age has U-shaped relationship with injury risk
-        age_risk = 0.1 * ((age - 25) ** 2) / 25
-        
-        # Touches per game increases injury risk
-        touches_risk = 0.05 * np.log(1 + touches_per_game / 5)
-        
-        # Previous injury history increases risk
-        history_risk = 0.3 * injury_history
-        
-        # Season-specific factors (2021 had more injuries due to COVID impact)
-        season_factor = 1.0
-        if season == 2021:
-            season_factor = 1.2  # Higher injury rate in 2021
-        elif season == 2024:
-            season_factor = 0.9  # Lower injury rate in 2024 (better conditioning)
-        
-        # Combine risks
-        total_risk = (age_risk + touches_risk + history_risk) * season_factor
-        
-        # Add some randomness
-        total_risk += np.random.normal(0, 0.1)
-        
-        # Convert to binary injury outcome (1 = injured, 0 = healthy)
-        # Higher risk = more likely to be injured
-        injury_probability = 1 / (1 + np.exp(-(total_risk - 0.5)))
-        injury = np.random.binomial(1, injury_probability)
-        
-        # Generate player name
-        first_names = ['James', 'Michael', 'David', 'John', 'Robert', 'William', 'Richard', 'Joseph', 'Thomas', 'Christopher']
-        last_names = ['Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez', 'Hernandez']
-        
-        player_name = f"{random.choice(first_names)} {random.choice(last_names)}"
-        
-        # Create player record
-        player_data = {
-            'player': player_name,
-            'player_id': f"Player{i:03d}",
-            'season': season,
-            'age': age,
-            'games_played': games_played,
-            'touches_per_game': touches_per_game,
-            'yards_per_touch': yards_per_touch,
-            'injury_history': injury_history,
-            'position': position,
-            'injury': injury,
-            'injury_risk_score': total_risk
-        }
-        
-        data.append(player_data)
-    
-    return pd.DataFrame(data)
+    # Seeded generator for reproducibility; every draw below is one vector
+    # across all players
+    rng = np.random.default_rng(42 + season)
+    
+    # Age distribution: most RBs are 22-28, some veterans 29-32
+    is_young = rng.random(n_players) < 0.8
+    age = np.where(is_young, rng.normal(25, 2, n_players), rng.normal(30, 2, n_players))
+    age = np.clip(age.astype(int), 21, 35)
+    
+    # Games played: most play 12-17 games, some get injured
+    is_healthy = rng.random(n_players) < 0.7
+    games_played = np.where(is_healthy, rng.poisson(15, n_players), rng.poisson(8, n_players))
+    games_played = np.clip(games_played, 1, 18)
+    
+    # Touches per game: varies by role (starter vs backup)
+    is_starter = rng.random(n_players) < 0.6
+    touches_per_game = np.where(is_starter, rng.normal(18, 4, n_players), rng.normal(8, 3, n_players))
+    touches_per_game = np.maximum(touches_per_game, 1)
+    
+    # Yards per touch: typically 4-6 yards
+    yards_per_touch = np.clip(rng.normal(4.5, 0.8, n_players), 2.5, 7.0)
+    
+    # Injury history: 30% have previous injuries
+    injury_history = rng.binomial(1, 0.3, n_players)
+    
+    # Season-specific factors (2021 had more injuries due to COVID impact)
+    season_factor = 1.0
+    if season == 2021:
+        season_factor = 1.2  # Higher injury rate in 2021
+    elif season == 2024:
+        season_factor = 0.9  # Lower injury rate in 2024 (better conditioning)
+    
+    # Combine risks, with some randomness
+    total_risk, injury_probability = injury_risk_scores(
+        age, touches_per_game, injury_history, season_factor, rng.normal(0, 0.1, n_players)
+    )
+    
+    # Convert to binary injury outcome (1 = injured, 0 = healthy)
+    # Higher risk = more likely to be injured
+    injury = rng.binomial(1, injury_probability)
+    
+    # Generate player names by indexing the name arrays with drawn positions
+    first_idx = rng.integers(0, len(FIRST_NAMES), n_players)
+    last_idx = rng.integers(0, len(LAST_NAMES), n_players)
+    player_names = np.char.add(np.char.add(FIRST_NAMES[first_idx], ' '), LAST_NAMES[last_idx])
+    
+    # Assemble all player records in one frame (all RBs for this dataset)
+    return pd.DataFrame({
+        'player': player_names,
+        'player_id': [f"Player{i:03d}" for i in range(n_players)],
+        'season': season,
+        'age': age,
+        'games_played': games_played,
+        'touches_per_game': touches_per_game,
+        'yards_per_touch': yards_per_touch,
+        'injury_history': injury_history,
+        'position': 'RB',
+        'injury': injury,
+        'injury_risk_score': total_risk
+    })
 
 def main():
     """Generate RB data for all seasons."""
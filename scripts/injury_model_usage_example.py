@@ -7,24 +7,74 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import json
+import argparse
+import hashlib
+from pathlib import Path
+
+import joblib
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.apply_injury_model import RBInjuryModel
 
+TRAINING_CSV = 'data/rb_synthetic_data.csv'
+
+# Fitted model, stored with the hash of the training CSV it was fitted on and
+# of the code that prepares the features and trains it
+MODEL_CACHE = Path('.cache') / 'rb_injury_model.joblib'
+MODEL_CODE_FILES = [Path(__file__), Path(__file__).with_name('apply_injury_model.py')]
+
+# Prepared feature frames, keyed by a content hash of the raw data. This only
+# helps repeated training within one process; a run consults it at most once.
+_FEATURE_CACHE = {}
+
+def prepare_features_cached(model, data):
+    """Return model.prepare_features(data), reusing the result for identical data."""
+    # Row hashes ignore the column labels, so fold those into the digest too
+    digest = hashlib.blake2b(pd.util.hash_pandas_object(data, index=False).values.tobytes(), digest_size=16)
+    digest.update(repr(list(data.columns)).encode())
+    key = digest.hexdigest()
+    if key not in _FEATURE_CACHE:
+        _FEATURE_CACHE[key] = model.prepare_features(data)
+    X = _FEATURE_CACHE[key]
+    # prepare_features records the feature names on the model, so do the same on a hit
+    model.feature_names = X.columns.tolist()
+    return X
+
 def load_trained_model():
-    """Load and return a trained injury model."""
+    """Load and return a trained injury model.
+    
+    The fitted model is cached on disk and reused until the training CSV or
+    the model code changes.
+    """
+    digest = hashlib.md5(Path(TRAINING_CSV).read_bytes())
+    for code_file in MODEL_CODE_FILES:
+        digest.update(code_file.read_bytes())
+    key = digest.hexdigest()
+    if MODEL_CACHE.exists():
+        try:
+            cached = joblib.load(MODEL_CACHE)
+            if cached.get('key') == key:
+                print(f"✓ Loaded cached injury model from {MODEL_CACHE}")
+                return cached['model']
+        except Exception as e:
+            print(f"Could not read cached model ({e}), retraining...")
     
     # Load the synthetic data
-    data = pd.read_csv('data/rb_synthetic_data.csv')
+    data = pd.read_csv(TRAINING_CSV)
     
     # Initialize and train the model
     model = RBInjuryModel()
-    X = model.prepare_features(data)
+    X = prepare_features_cached(model, data)
     y = data['injury']
     
     # Train the model
     print("Training injury model...")
     model.train(X, y)
     
+    MODEL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump({'key': key, 'model': model}, MODEL_CACHE, compress=3)
+    
     return model
 
 def predict_injury_risk_for_player(model, player_data):
@@ -38,6 +88,17 @@ def predict_injury_risk_for_player(model, player_data):
     
     return risk[0]
 
+def predict_injury_risk_for_players(model, players):
+    """Predict injury risk for several players with a single model call.
+    
+    prepare_features derives its spline knots from the rows it is given, so
+    each player's features are still built on their own row (as in
+    predict_injury_risk_for_player); only the classifier runs once on the
+    stacked rows.
+    """
+    X = pd.concat([model.prepare_features(pd.DataFrame([player])) for player in players], ignore_index=True)
+    return model.model.predict_proba(X)[:, 1]
+
 def analyze_player_risk(player_data, risk_score):
     """Analyze and interpret the injury risk for a player."""
     
@@ -83,6 +144,10 @@ def analyze_player_risk(player_data, risk_score):
 
 def main():
     """Main function demonstrating injury model usage."""
+    parser = argparse.ArgumentParser(description='Demonstrate the RB injury risk model')
+    parser.add_argument('--players-json', help='JSON file with a list of custom players to score in one batch')
+    parser.add_argument('--interactive', action='store_true', help='Prompt for one custom player on stdin')
+    args = parser.parse_args()
     
     print("RB Injury Risk Model - Usage Example")
     print("=" * 50)
@@ -94,10 +159,6 @@ def main():
     print(f"Features used: {model.feature_names}")
     
     # Example 1: High-risk veteran RB
-    print(f"\n" + "="*60)
-    print("EXAMPLE 1: High-Risk Veteran RB")
-    print("="*60)
-    
     veteran_rb = {
         'name': 'Derrick Henry',
         'age': 30,
@@ -108,14 +169,7 @@ def main():
         'position': 'RB'
     }
     
-    risk = predict_injury_risk_for_player(model, veteran_rb)
-    analyze_player_risk(veteran_rb, risk)
-    
     # Example 2: Low-risk young backup
-    print(f"\n" + "="*60)
-    print("EXAMPLE 2: Low-Risk Young Backup")
-    print("="*60)
-    
     young_backup = {
         'name': 'Bijan Robinson',
         'age': 22,
@@ -126,14 +180,7 @@ def main():
         'position': 'RB'
     }
     
-    risk = predict_injury_risk_for_player(model, young_backup)
-    analyze_player_risk(young_backup, risk)
-    
     # Example 3: Medium-risk starter
-    print(f"\n" + "="*60)
-    print("EXAMPLE 3: Medium-Risk Starter")
-    print("="*60)
-    
     starter_rb = {
         'name': 'Saquon Barkley',
         'age': 27,
@@ -144,39 +191,72 @@ def main():
         'position': 'RB'
     }
     
-    risk = predict_injury_risk_for_player(model, starter_rb)
-    analyze_player_risk(starter_rb, risk)
+    examples = [
+        ("EXAMPLE 1: High-Risk Veteran RB", veteran_rb),
+        ("EXAMPLE 2: Low-Risk Young Backup", young_backup),
+        ("EXAMPLE 3: Medium-Risk Starter", starter_rb),
+    ]
     
-    # Example 4: Custom player analysis
-    print(f"\n" + "="*60)
-    print("CUSTOM PLAYER ANALYSIS")
-    print("="*60)
+    # Score all example players in one batch
+    risks = predict_injury_risk_for_players(model, [player for _, player in examples])
     
-    print("Enter player details for custom analysis:")
+    for (title, player), risk in zip(examples, risks):
+        print(f"\n" + "="*60)
+        print(title)
+        print("="*60)
+        analyze_player_risk(player, risk)
     
-    try:
-        name = input("Player name: ").strip() or "Custom Player"
-        age = int(input("Age (21-35): ") or "25")
-        games = int(input("Expected games played (1-18): ") or "15")
-        touches = float(input("Expected touches per game (1-30): ") or "15")
-        yards = float(input("Expected yards per touch (2-8): ") or "4.5")
-        history = int(input("Previous injury history (0=No, 1=Yes): ") or "0")
-        
-        custom_player = {
-            'name': name,
-            'age': age,
-            'games_played': games,
-            'touches_per_game': touches,
-            'yards_per_touch': yards,
-            'injury_history': history,
-            'position': 'RB'
-        }
+    # Example 4: Custom player analysis
+    if args.players_json or args.interactive:
+        print(f"\n" + "="*60)
+        print("CUSTOM PLAYER ANALYSIS")
+        print("="*60)
+    
+    if args.players_json:
+        # Score every player in the file with one batched prediction
+        try:
+            with open(args.players_json) as f:
+                custom_players = [{'position': 'RB', **player} for player in json.load(f)]
+            
+            for i, player in enumerate(custom_players, 1):
+                player.setdefault('name', f"Custom Player {i}")
+            
+            risks = predict_injury_risk_for_players(model, custom_players)
+            for player, risk in zip(custom_players, risks):
+                analyze_player_risk(player, risk)
         
-        risk = predict_injury_risk_for_player(model, custom_player)
-        analyze_player_risk(custom_player, risk)
+        except Exception as e:
+            print(f"✗ Could not score players from {args.players_json}: {e}")
+    
+    elif args.interactive:
+        print("Enter player details for custom analysis:")
         
-    except (ValueError, KeyboardInterrupt):
-        print("\nCustom analysis skipped.")
+        try:
+            name = input("Player name: ").strip() or "Custom Player"
+            age = int(input("Age (21-35): ") or "25")
+            games = int(input("Expected games played (1-18): ") or "15")
+            touches = float(input("Expected touches per game (1-30): ") or "15")
+            yards = float(input("Expected yards per touch (2-8): ") or "4.5")
+            history = int(input("Previous injury history (0=No, 1=Yes): ") or "0")
+            
+            custom_player = {
+                'name': name,
+                'age': age,
+                'games_played': games,
+                'touches_per_game': touches,
+                'yards_per_touch': yards,
+                'injury_history': history,
+                'position': 'RB'
+            }
+            
+            risk = predict_injury_risk_for_player(model, custom_player)
+            analyze_player_risk(custom_player, risk)
+            
+        except (ValueError, KeyboardInterrupt, EOFError):
+            print("\nCustom analysis skipped.")
+    
+    else:
+        print("\nPass --players-json or --interactive to analyze custom players.")
     
     # Summary of model capabilities
     print(f"\n" + "="*60)
@@ -7,116 +7,118 @@ Models the likelihood of additional missed time if a player missed time in previ
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
+from sklearn.inspection import permutation_importance
 import matplotlib.pyplot as plt
 import seaborn as sns
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
-def create_injury_history_features(df):
+CLEANED_DATA_CSV = "data/multi_season_final/cleaned_three_season_injury_data.csv"
+
+def load_cleaned_data(csv_path=CLEANED_DATA_CSV):
+    """Load the cleaned dataset from its Parquet copy, refreshing the copy when the CSV is newer."""
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return pd.read_parquet(parquet_path, engine='pyarrow')
+    
+    df = pd.read_csv(csv_path)
+    try:
+        df.to_parquet(parquet_path, engine='pyarrow', index=False)
+    except Exception as e:
+        print(f"  ✗ Could not write Parquet copy {parquet_path}: {e}")
+    return df
+
+def compute_season_stats(df):
+    """Injured and total games per player season, sorted by player and season."""
+    return df.groupby(['player_id', 'season'], sort=True, observed=True, as_index=False).agg(
+        injury_games=('injured', 'sum'),
+        total_games=('injured', 'count'),
+    )
+
+def create_injury_history_features(df, season_stats=None):
     """Create features that capture injury history patterns."""
     print("Creating injury history features...")
     
     # Sort by player and season for proper time series
     df = df.sort_values(['player_id', 'season', 'Week']).reset_index(drop=True)
     
-    # Initialize new columns
-    df['has_prior_injury_season'] = False
-    df['injury_seasons_count'] = 0
-    df['total_injury_games'] = 0
-    df['injury_rate_prior_seasons'] = 0.0
-    df['consecutive_injury_seasons'] = 0
-    df['last_injury_season'] = 0
-    df['seasons_since_last_injury'] = 0
-    df['injury_severity_prior'] = 0.0  # Average games missed per injury season
-    
-    # Calculate injury history for each player
-    for player_id in df['player_id'].unique():
-        player_mask = df['player_id'] == player_id
-        player_data = df[player_mask].copy()
-        
-        # Group by season to get injury patterns
-        season_injuries = player_data.groupby('season').agg({
-            'injured': ['sum', 'count', 'mean']
-        }).round(3)
-        
-        season_injuries.columns = ['injury_games', 'total_games', 'injury_rate']
-        season_injuries = season_injuries.reset_index()
-        
-        # Calculate cumulative injury history
-        injury_seasons = season_injuries[season_injuries['injury_games'] > 0]['season'].tolist()
-        total_injury_games = season_injuries['injury_games'].sum()
-        
-        # For each game, calculate prior injury history
-        for idx, row in player_data.iterrows():
-            current_season = row['season']
-            
-            # Prior seasons (before current season)
-            prior_seasons = season_injuries[season_injuries['season'] < current_season]
-            
-            if len(prior_seasons) > 0:
-                # Has player had injury seasons before?
-                prior_injury_seasons = prior_seasons[prior_seasons['injury_games'] > 0]
-                df.loc[idx, 'has_prior_injury_season'] = len(prior_injury_seasons) > 0
-                df.loc[idx, 'injury_seasons_count'] = len(prior_injury_seasons)
-                df.loc[idx, 'total_injury_games'] = prior_seasons['injury_games'].sum()
-                df.loc[idx, 'injury_rate_prior_seasons'] = prior_seasons['injury_rate'].mean()
-                
-                # Consecutive injury seasons
-                if len(prior_injury_seasons) > 0:
-                    injury_seasons_list = sorted(prior_injury_seasons['season'].tolist())
-                    consecutive_count = 0
-                    for i in range(len(injury_seasons_list) - 1, -1, -1):
-                        if i == len(injury_seasons_list) - 1 or injury_seasons_list[i] == injury_seasons_list[i+1] - 1:
-                            consecutive_count += 1
-                        else:
-                            break
-                    df.loc[idx, 'consecutive_injury_seasons'] = consecutive_count
-                    
-                    # Seasons since last injury
-                    last_injury_season = max(injury_seasons_list)
-                    df.loc[idx, 'last_injury_season'] = last_injury_season
-                    df.loc[idx, 'seasons_since_last_injury'] = current_season - last_injury_season
-                    
-                    # Injury severity (average games missed per injury season)
-                    df.loc[idx, 'injury_severity_prior'] = prior_injury_seasons['injury_games'].mean()
+    # Season-level injury table, one row per player season
+    if season_stats is None:
+        season_stats = compute_season_stats(df)
+    season_tbl = season_stats.assign(
+        injury_rate=(season_stats['injury_games'] / season_stats['total_games']).round(3)
+    )
+    is_injury_season = season_tbl['injury_games'] > 0
+    is_injury = is_injury_season.astype('int64')
+    player_ids = season_tbl['player_id']
+    by_player = season_tbl.groupby('player_id', sort=False, observed=True)
+    
+    # Cumulative totals up to each season, shifted so every season only sees
+    # the seasons before it
+    seasons_prior = by_player.cumcount()
+    injury_seasons_prior = is_injury.groupby(player_ids, observed=True).cumsum() - is_injury
+    injury_games_prior = by_player['injury_games'].cumsum() - season_tbl['injury_games']
+    rate_sum_prior = by_player['injury_rate'].cumsum().groupby(player_ids, observed=True).shift(1)
+    
+    # Consecutive injury seasons: run-length encode injury seasons within each
+    # player, starting a new run whenever the flag flips or a year is skipped
+    previous_injury = is_injury.groupby(player_ids, observed=True).shift(fill_value=0)
+    run_break = is_injury.ne(previous_injury) | by_player['season'].diff().ne(1)
+    run_id = run_break.cumsum()
+    run_length = (is_injury.groupby(run_id).cumcount() + 1).where(is_injury_season)
+    
+    # Carry the latest injury season forward to later seasons of the same player
+    last_injury = season_tbl['season'].where(is_injury_season).groupby(player_ids, observed=True).ffill()
+    last_injury = last_injury.groupby(player_ids, observed=True).shift(1)
+    last_run_length = run_length.groupby(player_ids, observed=True).ffill().groupby(player_ids, observed=True).shift(1)
+    has_prior_injury = injury_seasons_prior > 0
+    
+    features = pd.DataFrame({
+        'player_id': season_tbl['player_id'],
+        'season': season_tbl['season'],
+        'has_prior_injury_season': has_prior_injury,
+        'injury_seasons_count': injury_seasons_prior.astype('int64'),
+        'total_injury_games': injury_games_prior.astype('int64'),
+        'injury_rate_prior_seasons': (rate_sum_prior / seasons_prior).fillna(0.0),
+        'consecutive_injury_seasons': last_run_length.fillna(0).astype('int64'),
+        'last_injury_season': last_injury.fillna(0).astype('int64'),
+        'seasons_since_last_injury': (season_tbl['season'] - last_injury).fillna(0).astype('int64'),
+        # Average games missed per injury season
+        'injury_severity_prior': (injury_games_prior / injury_seasons_prior).where(has_prior_injury, 0.0),
+    })
+    
+    # Join the per-season history back onto every game of that season
+    df = df.merge(features, on=['player_id', 'season'], how='left')
     
     print(f"  ✅ Created injury history features")
     return df
 
-def create_recurrence_target(df):
+def create_recurrence_target(df, season_stats=None):
     """Create target variable for injury recurrence."""
     print("Creating recurrence target variable...")
     
     # Sort by player and season
     df = df.sort_values(['player_id', 'season', 'Week']).reset_index(drop=True)
     
-    # Initialize target
-    df['injury_recurrence'] = False
-    
-    # For each player, identify if they have injury recurrence
-    for player_id in df['player_id'].unique():
-        player_mask = df['player_id'] == player_id
-        player_data = df[player_mask].copy()
-        
-        # Group by season
-        season_summary = player_data.groupby('season').agg({
-            'injured': 'sum'
-        }).reset_index()
-        season_summary.columns = ['season', 'injury_games']
-        
-        # Identify seasons with injuries
-        injury_seasons = season_summary[season_summary['injury_games'] > 0]['season'].tolist()
-        
-        # Mark recurrence: if player has injuries in multiple seasons
-        if len(injury_seasons) > 1:
-            # Mark all games in seasons after the first injury season as potential recurrence
-            first_injury_season = min(injury_seasons)
-            recurrence_mask = (df['player_id'] == player_id) & (df['season'] > first_injury_season)
-            df.loc[recurrence_mask, 'injury_recurrence'] = True
+    # Seasons in which each player missed time, broadcast to all their seasons
+    if season_stats is None:
+        season_stats = compute_season_stats(df)
+    injury_season = season_stats['season'].where(season_stats['injury_games'] > 0)
+    player_injury_seasons = injury_season.groupby(season_stats['player_id'], observed=True)
+    first_injury_season = player_injury_seasons.transform('min')
+    injury_season_count = player_injury_seasons.transform('count')
+    
+    # Mark recurrence: if player has injuries in multiple seasons, mark all
+    # games in seasons after the first injury season as potential recurrence
+    recurrence = season_stats[['player_id', 'season']].assign(
+        injury_recurrence=(injury_season_count > 1) & (season_stats['season'] > first_injury_season)
+    )
+    df = df.merge(recurrence, on=['player_id', 'season'], how='left')
     
     # Alternative definition: mark games where player is injured AND has prior injury history
     df['injury_recurrence_alt'] = df['injured'] & df['has_prior_injury_season']
@@ -161,7 +163,7 @@ def analyze_injury_patterns(df):
     
     # Player-level analysis
     print(f"\nPlayer-Level Injury Patterns:")
-    player_summary = df.groupby('player_id').agg({
+    player_summary = df.groupby('player_id', observed=True).agg({
         'injured': 'sum',
         'has_prior_injury_season': 'any',
         'injury_seasons_count': 'max',
@@ -197,8 +199,9 @@ def train_recurrence_model(df):
     available_features = [col for col in feature_columns if col in df.columns]
     print(f"Using features: {available_features}")
     
-    # Prepare data
-    X = df[available_features].fillna(0)
+    # Prepare data as a single float32 matrix (booleans become 0/1), which
+    # the tree models use without an upcast copy
+    X = df[available_features].fillna(0).astype('float32')
     
     # Use alternative recurrence definition (more specific)
     y = df['injury_recurrence_alt']
@@ -212,10 +215,17 @@ def train_recurrence_model(df):
     # Train multiple models
     models = {
         'Logistic Regression': LogisticRegression(random_state=42, class_weight='balanced', max_iter=1000),
-        'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42, class_weight='balanced')
+        'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42, class_weight='balanced', n_jobs=-1),
+        # Histogram-binned boosting: features are bucketed into 256 bins, so
+        # split finding is much cheaper than the forest's exact splits
+        'HistGBM': HistGradientBoostingClassifier(max_iter=200, class_weight='balanced', early_stopping=True, random_state=42)
     }
     
+    # Stratify the CV folds once and reuse the same splits for every model
+    cv_splits = list(StratifiedKFold(n_splits=5, shuffle=True, random_state=42).split(X_train, y_train))
+    
     results = {}
+    y_test_values = y_test.to_numpy()
     
     for name, model in models.items():
         print(f"\nTraining {name}...")
@@ -223,16 +233,17 @@ def train_recurrence_model(df):
         # Train model
         model.fit(X_train, y_train)
         
-        # Make predictions
+        # Make predictions, kept as plain numpy arrays
         y_pred = model.predict(X_test)
-        y_pred_proba = model.predict_proba(X_test)[:, 1]
+        y_pred_proba = model.predict_proba(X_test)[:, 1].astype(np.float32)
         
         # Calculate metrics
-        auc_score = roc_auc_score(y_test, y_pred_proba)
-        accuracy = (y_pred == y_test).mean()
+        auc_score = roc_auc_score(y_test_values, y_pred_proba)
+        accuracy = np.mean(y_pred == y_test_values)
         
-        # Cross-validation
-        cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='roc_auc')
+        # Cross-validation; the folds run one at a time since the forest and
+        # HistGBM already use every core within each fit
+        cv_scores = cross_val_score(model, X_train, y_train, cv=cv_splits, scoring='roc_auc')
         
         results[name] = {
             'model': model,
@@ -256,7 +267,8 @@ def evaluate_recurrence_model(results, X_test, y_test, feature_names):
     print("=" * 50)
     
     # Find best model
-    best_model_name = max(results.keys(), key=lambda x: results[x]['auc_score'])
+    model_names = list(results)
+    best_model_name = model_names[np.argmax([results[name]['auc_score'] for name in model_names])]
     best_model = results[best_model_name]
     
     print(f"Best Model: {best_model_name}")
@@ -282,6 +294,16 @@ def evaluate_recurrence_model(results, X_test, y_test, feature_names):
             'coefficient': best_model['model'].coef_[0]
         }).sort_values('coefficient', key=abs, ascending=False)
         print(feature_importance.head(10).to_string(index=False))
+    else:
+        # HistGBM has no built-in importances, so measure the AUC drop when
+        # each feature is shuffled on the test set
+        print(f"\nTop 10 Most Important Features (Permutation):")
+        permutation = permutation_importance(best_model['model'], X_test, y_test, scoring='roc_auc', n_repeats=5, random_state=42)
+        feature_importance = pd.DataFrame({
+            'feature': feature_names,
+            'importance': permutation.importances_mean
+        }).sort_values('importance', ascending=False)
+        print(feature_importance.head(10).to_string(index=False))
     
     return best_model_name, best_model
 
@@ -292,20 +314,27 @@ def main():
     
     # Load the cleaned dataset
     print("Loading cleaned dataset...")
-    df = pd.read_csv("data/multi_season_final/cleaned_three_season_injury_data.csv")
+    df = load_cleaned_data()
     print(f"  ✅ Loaded {len(df)} games from {df['player_id'].nunique()} players")
     
+    # Player IDs are only used as grouping keys, so hash their category codes
+    # instead of the strings
+    df['player_id'] = df['player_id'].astype('category')
+    
     # Create additional features
     print("Creating additional features...")
     df['touches_per_game'] = df['Att'] + df['Rec']
     df['late_season'] = (df['Week'] > 12).astype(int)
-    df['games_played'] = df.groupby('player_id').cumcount() + 1
+    df['games_played'] = df.groupby('player_id', observed=True).cumcount() + 1
+    
+    # Aggregate injuries per player season once for both feature steps
+    season_stats = compute_season_stats(df)
     
     # Create injury history features
-    df = create_injury_history_features(df)
+    df = create_injury_history_features(df, season_stats)
     
     # Create recurrence target
-    df = create_recurrence_target(df)
+    df = create_recurrence_target(df, season_stats)
     
     # Analyze injury patterns
     analyze_injury_patterns(df)
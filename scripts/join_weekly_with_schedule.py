@@ -5,25 +5,25 @@ Adds played (1/0), reason (optional), targets/rush_att/receptions defaulting to
 """
 import argparse, os, pandas as pd
 
+# Only these columns are used; weekly logs may lack some of them (e.g. reason)
+WEEKLY_COLS = ["player","player_id","year","team","Week","targets","receptions","rush_att","reason"]
+WEEKLY_DTYPES = {"Week":"int16","year":"int16","team":"category","targets":"float32","receptions":"float32","rush_att":"float32"}
+SCHEDULE_COLS = ["Week","team","year"]
+SCHEDULE_DTYPES = {"Week":"int16","year":"int16","team":"category"}
+
 def merge_player_schedule(weekly_csv:str, schedule_csv:str, out_csv:str):
-    w = pd.read_csv(weekly_csv)
-    s = pd.read_csv(schedule_csv)
+    w = pd.read_csv(weekly_csv, usecols=lambda c: c in WEEKLY_COLS, dtype=WEEKLY_DTYPES)
+    s = pd.read_csv(schedule_csv, usecols=SCHEDULE_COLS, dtype=SCHEDULE_DTYPES)
     team = (w["team"].dropna().astype(str).str.upper().iloc[0]) if "team" in w.columns and len(w["team"].dropna())>0 else s["team"].iloc[0]
     year = int(w["year"].iloc[0]) if "year" in w.columns else int(s["year"].iloc[0])
-    s_use = s[["Week","team","year"]].copy()
-    s_use = s_use[(s_use["team"]==team) & (s_use["year"]==year)]
-    merged = s_use.merge(w, on="Week", how="left", suffixes=("","_w"))
-    merged["played"] = merged["player"].notna().astype(int)
-    for col, default in [("targets",0),("receptions",0),("rush_att",0)]:
-        if col not in merged.columns:
-            merged[col] = 0
-        merged[col] = merged[col].fillna(default)
-    if "reason" not in merged.columns:
-        merged["reason"] = None
+    # The team's schedule weeks index the full table; look the weekly log up by week
+    weeks = s.loc[(s["team"]==team) & (s["year"]==year), "Week"]
+    out = w.set_index("Week").reindex(pd.Index(weeks, name="Week")).reset_index()
+    out["team"] = team
+    out["year"] = year
+    out["played"] = out["player"].notna().astype(int)
     keep = ["player","player_id","year","team","Week","targets","receptions","rush_att","played","reason"]
-    for k in keep:
-        if k not in merged.columns: merged[k] = None
-    out = merged[keep]
+    out = out.reindex(columns=keep).fillna({"targets":0,"receptions":0,"rush_att":0})
     out.to_csv(out_csv, index=False)
     return out
 
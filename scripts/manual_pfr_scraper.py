@@ -4,20 +4,44 @@ Manual PFR scraper for RB data with better headers and manual verification.
 This approach should bypass the blocking issues we encountered.
 """
 import requests
+import pyarrow as pa
+import pyarrow.parquet as pq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import time
 import random
 from bs4 import BeautifulSoup
+import lxml.html
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from page_cache import cache_get, cache_put
+
 class ManualPFRScraper:
     """Manual scraper for Pro Football Reference with enhanced headers."""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.setup_headers()
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._local = threading.local()
+    
+    @property
+    def session(self):
+        """Session for the calling thread, created with the browser headers on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            # Keep-alive pool with HTTP-level retries for transient errors;
+            # 403s are still handled by get_page's user-agent rotation
+            retry = Retry(total=3, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self.setup_headers()
+        return session
         
     def setup_headers(self):
         """Set up realistic browser headers."""
@@ -37,7 +61,12 @@ class ManualPFRScraper:
         })
     
     def get_page(self, url, max_retries=3):
-        """Get a page with retry logic and better error handling."""
+        """Get a page with retry logic and better error handling, reusing a recent cached copy."""
+        html = cache_get(url)
+        if html is not None:
+            print(f"  ✓ Using cached page for {url}")
+            return html
+        
         for attempt in range(max_retries):
             try:
                 print(f"  Attempt {attempt + 1}: Fetching {url}")
@@ -46,6 +75,7 @@ class ManualPFRScraper:
                 
                 if response.status_code == 200:
                     print(f"  ✓ Success! Status: {response.status_code}")
+                    cache_put(url, response.text)
                     return response.text
                 elif response.status_code == 403:
                     print(f"  ✗ Forbidden (403) - attempt {attempt + 1}")
@@ -88,41 +118,42 @@ class ManualPFRScraper:
         if not html_content:
             return None
         
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Parse with lxml's C parser rather than BeautifulSoup's html.parser
+        root = lxml.html.fromstring(html_content)
         
         # Look for the main stats table
-        stats_table = soup.find('table', {'id': 'stats'})
-        if not stats_table:
+        stats_tables = root.xpath('//table[@id="stats"]')
+        if not stats_tables:
             print(f"  ✗ No stats table found for {player_id} {season}")
             return None
         
-        # Extract table data
-        rows = stats_table.find_all('tr')
+        # Extract table data, with each cell's stripped text pieces joined
+        # as get_text(strip=True) did
+        rows = stats_tables[0].xpath('.//tr')
         game_stats = []
         
         for row in rows[1:]:  # Skip header row
-            cells = row.find_all(['td', 'th'])
+            cells = ["".join(text.strip() for text in cell.itertext()) for cell in row.xpath('./td|./th')]
             if len(cells) > 10:  # Ensure we have enough columns
                 game_data = {}
                 
                 # Extract key stats (adjust indices based on actual table structure)
                 try:
-                    game_data['week'] = cells[0].get_text(strip=True) if len(cells) > 0 else ''
-                    game_data['date'] = cells[1].get_text(strip=True) if len(cells) > 1 else ''
-                    game_data['team'] = cells[2].get_text(strip=True) if len(cells) > 2 else ''
-                    game_data['opponent'] = cells[3].get_text(strip=True) if len(cells) > 3 else ''
-                    game_data['result'] = cells[4].get_text(strip=True) if len(cells) > 4 else ''
+                    game_data['week'] = cells[0] if len(cells) > 0 else ''
+                    game_data['date'] = cells[1] if len(cells) > 1 else ''
+                    game_data['team'] = cells[2] if len(cells) > 2 else ''
+                    game_data['opponent'] = cells[3] if len(cells) > 3 else ''
+                    game_data['result'] = cells[4] if len(cells) > 4 else ''
                     
                     # Rushing stats
-                    game_data['rush_att'] = cells[5].get_text(strip=True) if len(cells) > 5 else '0'
-                    game_data['rush_yds'] = cells[6].get_text(strip=True) if len(cells) > 6 else '0'
-                    game_data['rush_td'] = cells[7].get_text(strip=True) if len(cells) > 7 else '0'
+                    game_data['rush_att'] = cells[5] if len(cells) > 5 else '0'
+                    game_data['rush_yds'] = cells[6] if len(cells) > 6 else '0'
+                    game_data['rush_td'] = cells[7] if len(cells) > 7 else '0'
                     
                     # Receiving stats
-                    game_data['rec'] = cells[8].get_text(strip=True) if len(cells) > 8 else '0'
-                    game_data['rec_yds'] = cells[9].get_text(strip=True) if len(cells) > 9 else '0'
-                    game_data['rec_td'] = cells[10].get_text(strip=True) if len(cells) > 10 else '0'
+                    game_data['rec'] = cells[8] if len(cells) > 8 else '0'
+                    game_data['rec_yds'] = cells[9] if len(cells) > 9 else '0'
+                    game_data['rec_td'] = cells[10] if len(cells) > 10 else '0'
                     
                     # Only add if it's a regular season game (not preseason/playoffs)
                     if game_data['week'].isdigit() and int(game_data['week']) <= 18:
@@ -182,6 +213,54 @@ class ManualPFRScraper:
         print(f"  ✓ Player info: {player_info.get('name', 'Unknown')} - {player_info.get('position', 'Unknown')}")
         return player_info
     
+    def process_player(self, season, player_id, player_name):
+        """Scrape one player's info and season stats; returns (season totals, games), or Nones if skipped."""
+        # Get player info first
+        player_info = self.scrape_player_info(player_id)
+        if not player_info or player_info.get('position') != 'RB':
+            print(f"  Skipping {player_name} - not a RB")
+            return None, None
+        
+        # Get season stats
+        game_stats = self.scrape_player_stats(player_id, season)
+        
+        season_totals = games_df = None
+        if game_stats:
+            # Convert the counting stats once and total them in one pass
+            games_df = pd.DataFrame(game_stats)
+            stat_cols = ['rush_att', 'rush_yds', 'rec', 'rec_yds']
+            totals = games_df[stat_cols].astype(int).sum()
+            total_touches = totals['rush_att'] + totals['rec']
+            total_yards = totals['rush_yds'] + totals['rec_yds']
+            
+            # Calculate season totals
+            season_totals = {
+                'player_id': player_id,
+                'player_name': player_name,
+                'season': season,
+                'age': player_info.get('age_2024'),
+                'games_played': len(game_stats),
+                'total_rush_att': totals['rush_att'],
+                'total_rush_yds': totals['rush_yds'],
+                'total_rec': totals['rec'],
+                'total_rec_yds': totals['rec_yds'],
+                'total_touches': total_touches,
+                'avg_touches_per_game': total_touches / len(game_stats),
+                'avg_yards_per_touch': total_yards / total_touches if total_touches > 0 else 0
+            }
+            
+            print(f"  ✓ Added season totals for {player_name}")
+            
+            # Game data is buffered and written for the whole season at once
+            games_df['player_id'] = player_id
+        
+        # Random delay between players
+        delay = random.uniform(3, 8)
+        print(f"  Waiting {delay:.1f}s before next player...")
+        time.sleep(delay)
+        
+        return season_totals, games_df
+    
     def scrape_season_rbs(self, season, max_players=20):
         """Scrape RB data for a specific season."""
         print(f"\n{'='*60}")
@@ -203,61 +282,38 @@ class ManualPFRScraper:
             print(f"Limiting to first {max_players} players for testing...")
             players_df = players_df.head(max_players)
         
-        all_data = []
-        
-        for idx, row in players_df.iterrows():
-            player_id = row['player_id']
-            player_name = row['player']
-            
-            print(f"\n[{idx+1}/{len(players_df)}] Processing {player_name} ({player_id})")
-            
-            # Get player info first
-            player_info = self.scrape_player_info(player_id)
-            if not player_info or player_info.get('position') != 'RB':
-                print(f"  Skipping {player_name} - not a RB")
-                continue
-            
-            # Get season stats
-            game_stats = self.scrape_player_stats(player_id, season)
-            
-            if game_stats:
-                # Calculate season totals
-                season_totals = {
-                    'player_id': player_id,
-                    'player_name': player_name,
-                    'season': season,
-                    'age': player_info.get('age_2024'),
-                    'games_played': len(game_stats),
-                    'total_rush_att': sum(int(g.get('rush_att', 0)) for g in game_stats),
-                    'total_rush_yds': sum(int(g.get('rush_yds', 0)) for g in game_stats),
-                    'total_rec': sum(int(g.get('rec', 0)) for g in game_stats),
-                    'total_rec_yds': sum(int(g.get('rec_yds', 0)) for g in game_stats),
-                    'total_touches': sum(int(g.get('rush_att', 0)) + int(g.get('rec', 0)) for g in game_stats),
-                    'avg_touches_per_game': sum(int(g.get('rush_att', 0)) + int(g.get('rec', 0)) for g in game_stats) / len(game_stats) if game_stats else 0,
-                    'avg_yards_per_touch': 0
-                }
-                
-                # Calculate yards per touch separately to avoid complex one-liner
-                total_touches = sum(int(g.get('rush_att', 0)) + int(g.get('rec', 0)) for g in game_stats)
-                if total_touches > 0:
-                    total_yards = sum(int(g.get('rush_yds', 0)) + int(g.get('rec_yds', 0)) for g in game_stats)
-                    season_totals['avg_yards_per_touch'] = total_yards / total_touches
-                
-                all_data.append(season_totals)
-                print(f"  ✓ Added season totals for {player_name}")
-                
-                # Save individual game data
-                game_data_file = f"data/weekly_raw/{season}/{player_id}_games.csv"
-                os.makedirs(os.path.dirname(game_data_file), exist_ok=True)
-                
-                games_df = pd.DataFrame(game_stats)
-                games_df.to_csv(game_data_file, index=False)
-                print(f"  ✓ Saved {len(game_stats)} games to {game_data_file}")
+        # Players are scraped concurrently; each worker thread keeps its own
+        # session and sleeps between its own players to stay polite
+        results = [(None, None)] * len(players_df)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for idx, row in enumerate(players_df.itertuples(index=False)):
+                print(f"\n[{idx+1}/{len(players_df)}] Processing {row.player} ({row.player_id})")
+                futures[executor.submit(self.process_player, season, row.player_id, row.player)] = (idx, row.player_id)
             
-            # Random delay between players
-            delay = random.uniform(3, 8)
-            print(f"  Waiting {delay:.1f}s before next player...")
-            time.sleep(delay)
+            # One player's failure must not lose the players already scraped,
+            # since the games are only written once the season is done
+            for future in as_completed(futures):
+                idx, player_id = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    print(f"  ✗ Error processing {player_id}: {e}")
+        
+        # Keep the summary in the order of the players file
+        all_data = [season_totals for season_totals, _ in results if season_totals is not None]
+        game_frames = [games_df for _, games_df in results if games_df is not None]
+        
+        if game_frames:
+            # Save all game data in one Parquet dataset partitioned by player,
+            # replacing the partitions of players scraped again. It gets its own
+            # root, since the weekly scrapers write per-player CSVs into
+            # data/weekly_raw/{season} and those would break the dataset read
+            games_dir = f"data/weekly_games/{season}"
+            games_table = pa.Table.from_pandas(pd.concat(game_frames, ignore_index=True), preserve_index=False)
+            pq.write_to_dataset(games_table, root_path=games_dir, partition_cols=['player_id'],
+                                existing_data_behavior='delete_matching')
+            print(f"\n✓ Saved {games_table.num_rows} games for {len(game_frames)} players to {games_dir}")
         
         if all_data:
             # Save season summary
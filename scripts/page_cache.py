@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of fetched PFR pages.
+Pages are stored under .cache/pfr/ keyed by a hash of the URL, so re-runs
+within the TTL read from disk instead of going back to the network.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path(".cache") / "pfr"
+
+def _cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.html"
+
+def cache_get(url: str, ttl_hours: float = 24) -> Optional[str]:
+    """Return the cached page for url, or None if missing or older than the TTL."""
+    path = _cache_path(url)
+    try:
+        if path.stat().st_mtime < time.time() - ttl_hours * 3600:
+            return None
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+def cache_put(url: str, html: str) -> None:
+    """Store a page, writing to a temp file first so readers never see a partial page."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+        f.write(html)
+    os.replace(f.name, _cache_path(url))
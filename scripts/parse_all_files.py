@@ -6,19 +6,23 @@ Parse all PFR CSV files with all columns - Final Working Version.
 import pandas as pd
 import numpy as np
 import os
+import re
 import glob
 from pathlib import Path
 
+from file_pool import map_files
+
 def parse_single_file(file_path):
     """Parse a single PFR CSV file."""
     print(f"Parsing {os.path.basename(file_path)}...")
     
     try:
-        # Read with a large number of columns to capture everything
-        df = pd.read_csv(file_path, header=None, names=range(50))
+        # Read the two header rows on their own, with a large number of
+        # columns to capture everything
+        header = pd.read_csv(file_path, header=None, names=range(50), nrows=2)
         
         # Get the actual column names from row 1
-        column_names = df.iloc[1].values
+        column_names = header.iloc[1].values
         col_list = column_names.tolist()
         
         clean_column_names = []
@@ -28,16 +32,16 @@ def parse_single_file(file_path):
             else:
                 clean_column_names.append(str(col))
         
-        # Create a clean dataframe starting from row 2
-        data_df = df.iloc[2:].copy()
+        # Read the data rows straight into a fresh frame. Columns with header
+        # text stay strings, as they were when the header rows were parsed with them
+        text_columns = header.columns[header.notna().any()]
+        data_df = pd.read_csv(file_path, header=None, names=range(50), skiprows=2,
+                              dtype=dict.fromkeys(text_columns, str))
         data_df.columns = clean_column_names
         
         # Remove columns that are all NaN
         data_df = data_df.dropna(axis=1, how='all')
         
-        # Reset index
-        data_df = data_df.reset_index(drop=True)
-        
         # Add metadata
         filename = os.path.basename(file_path)
         player_id = filename.split('_')[0]
@@ -98,17 +102,26 @@ def create_injury_indicators(df):
         'Suspended'
     ]
     
-    # Check various columns for injury indicators
-    df['injured'] = False
+    # Check various columns for injury indicators, with a single alternation
+    # scan per column
+    injured = np.zeros(len(df), dtype=bool)
+    injury_pattern = '|'.join(map(re.escape, injury_indicators))
     
     for col in ['GS', 'Result', 'Team']:
         if col in df.columns:
-            for indicator in injury_indicators:
-                df.loc[df[col].astype(str).str.contains(indicator, case=False, na=False), 'injured'] = True
+            # Text columns are already strings; only convert the others, once
+            values = df[col]
+            if not pd.api.types.is_string_dtype(values):
+                values = values.astype(str)
+            injured |= values.str.contains(injury_pattern, case=False, na=False).to_numpy(dtype=bool)
     
     # Also check if key stats are missing (might indicate injury)
     if 'Att' in df.columns and 'Rec' in df.columns:
-        df.loc[(df['Att'].isna() | (df['Att'] == 0)) & (df['Rec'].isna() | (df['Rec'] == 0)), 'injured'] = True
+        att_missing = (df['Att'].isna() | df['Att'].eq(0)).to_numpy(dtype=bool)
+        rec_missing = (df['Rec'].isna() | df['Rec'].eq(0)).to_numpy(dtype=bool)
+        injured |= att_missing & rec_missing
+    
+    df['injured'] = injured
     
     return df
 
@@ -137,8 +150,9 @@ def main():
     parsed_data = []
     successful_files = 0
     
-    for csv_file in csv_files:
-        parsed_df = parse_single_file(csv_file)
+    results = map_files(parse_single_file, csv_files)
+    
+    for parsed_df in results:
         if parsed_df is not None and len(parsed_df) > 0:
             parsed_data.append(parsed_df)
             successful_files += 1
@@ -150,36 +164,31 @@ def main():
     # Combine all parsed data
     print(f"\nCombining {successful_files} files...")
     
-    # Get all unique columns
-    all_columns = set()
-    for df in parsed_data:
-        all_columns.update(df.columns)
-    
-    all_columns = sorted(list(all_columns))
-    
-    # Standardize all dataframes
-    standardized_dfs = []
-    for df in parsed_data:
-        df_copy = df.copy()
-        for col in all_columns:
-            if col not in df_copy.columns:
-                df_copy[col] = np.nan
-        df_copy = df_copy[all_columns]
-        standardized_dfs.append(df_copy)
+    # Concat unions the columns itself (missing ones become NaN); sort them
+    # afterwards for a stable column order
+    combined_df = pd.concat(parsed_data, ignore_index=True, sort=False)
+    combined_df = combined_df.reindex(columns=sorted(combined_df.columns))
     
-    # Combine
-    combined_df = pd.concat(standardized_dfs, ignore_index=True)
+    # Low-cardinality text columns as categoricals; converted after the concat,
+    # since per-file categories would not survive it
+    for col in ['Team', 'Opp', 'Result', 'GS', 'player_id', 'source_file']:
+        if col in combined_df.columns:
+            combined_df[col] = combined_df[col].astype('category')
     
     # Create injury indicators
     print("Creating injury indicators...")
     combined_df = create_injury_indicators(combined_df)
     
-    # Save the parsed data
-    output_file = os.path.join(output_dir, "final_working_data.csv")
-    combined_df.to_csv(output_file, index=False)
+    # Save the parsed data as Parquet, which keeps the dtypes; a small CSV
+    # sample is kept alongside for quick inspection
+    output_file = os.path.join(output_dir, "final_working_data.parquet")
+    combined_df.to_parquet(output_file, engine="pyarrow", compression="snappy", index=False)
+    sample_file = os.path.join(output_dir, "final_working_data_sample.csv")
+    combined_df.head(100).to_csv(sample_file, index=False)
     
     print(f"\n✅ Successfully parsed all game data!")
     print(f"Output file: {output_file}")
+    print(f"Sample CSV: {sample_file}")
     print(f"Total games: {len(combined_df)}")
     print(f"Total players: {combined_df['player_id'].nunique()}")
     print(f"Total columns: {len(combined_df.columns)}")
@@ -194,7 +203,7 @@ def main():
     
     # Show injury summary
     if 'injured' in combined_df.columns:
-        injury_summary = combined_df.groupby('player_id')['injured'].sum().sort_values(ascending=False)
+        injury_summary = combined_df.groupby('player_id', observed=True)['injured'].sum().sort_values(ascending=False)
         print(f"\nInjury summary (games missed per player):")
         print(injury_summary.head(10).to_string())
     
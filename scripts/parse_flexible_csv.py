@@ -7,46 +7,46 @@ The CSV files have more columns than headers, so we need to handle this properly
 import pandas as pd
 import numpy as np
 import os
+import re
 import glob
 from pathlib import Path
 
+from file_pool import map_files
+
 def parse_flexible_csv(file_path):
     """Parse a PFR CSV file with flexible column handling."""
     print(f"Parsing {os.path.basename(file_path)}...")
     
     try:
-        # First, let's read the file as text to understand the structure
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
-        print(f"  File has {len(lines)} lines")
-        
-        # Read with a large number of columns to capture everything
-        df = pd.read_csv(file_path, header=None, names=range(50))  # Assume max 50 columns
-        
-        print(f"  Raw shape: {df.shape}")
-        
         # The structure is:
         # Row 0: Column group headers (like "Rushing", "Receiving", etc.)
         # Row 1: Actual column names
         # Row 2+: Data
         
+        # Read the two header rows on their own, with a large number of
+        # columns to capture everything
+        header = pd.read_csv(file_path, header=None, names=range(50), nrows=2)  # Assume max 50 columns
+        
         # Get the actual column names from row 1
-        column_names = df.iloc[1].values
+        column_names = header.iloc[1].values
         
         # Remove NaN values from column names
         column_names = [str(col) if not pd.isna(col) else f'col_{i}' for i, col in enumerate(column_names)]
         
-        # Create a clean dataframe starting from row 2
-        data_df = df.iloc[2:].copy()
+        # Read the data rows straight into a fresh frame. Columns with header
+        # text stay strings, as they were when the header rows were parsed with them
+        text_columns = header.columns[header.notna().any()]
+        data_df = pd.read_csv(file_path, header=None, names=range(50), skiprows=2,
+                              dtype=dict.fromkeys(text_columns, str))
         data_df.columns = column_names
         
+        # Every line of the file is a header or data row, so no separate text pass is needed
+        print(f"  File has {len(header) + len(data_df)} lines")
+        print(f"  Data shape: {data_df.shape}")
+        
         # Remove columns that are all NaN
         data_df = data_df.dropna(axis=1, how='all')
         
-        # Reset index
-        data_df = data_df.reset_index(drop=True)
-        
         # Add metadata
         filename = os.path.basename(file_path)
         player_id = filename.split('_')[0]
@@ -103,17 +103,26 @@ def create_injury_indicators(df):
         'Suspended'
     ]
     
-    # Check various columns for injury indicators
-    df['injured'] = False
+    # Check various columns for injury indicators, with a single alternation
+    # scan per column
+    injured = np.zeros(len(df), dtype=bool)
+    injury_pattern = '|'.join(map(re.escape, injury_indicators))
     
     for col in ['GS', 'Result', 'Team']:
         if col in df.columns:
-            for indicator in injury_indicators:
-                df.loc[df[col].astype(str).str.contains(indicator, case=False, na=False), 'injured'] = True
+            # Text columns are already strings; only convert the others, once
+            values = df[col]
+            if not pd.api.types.is_string_dtype(values):
+                values = values.astype(str)
+            injured |= values.str.contains(injury_pattern, case=False, na=False).to_numpy(dtype=bool)
     
     # Also check if key stats are missing (might indicate injury)
     if 'Att' in df.columns and 'Rec' in df.columns:
-        df.loc[(df['Att'].isna() | (df['Att'] == 0)) & (df['Rec'].isna() | (df['Rec'] == 0)), 'injured'] = True
+        att_missing = (df['Att'].isna() | df['Att'].eq(0)).to_numpy(dtype=bool)
+        rec_missing = (df['Rec'].isna() | df['Rec'].eq(0)).to_numpy(dtype=bool)
+        injured |= att_missing & rec_missing
+    
+    df['injured'] = injured
     
     return df
 
@@ -142,8 +151,9 @@ def main():
     parsed_data = []
     successful_files = 0
     
-    for csv_file in csv_files:
-        parsed_df = parse_flexible_csv(csv_file)
+    results = map_files(parse_flexible_csv, csv_files)
+    
+    for parsed_df in results:
         if parsed_df is not None and len(parsed_df) > 0:
             parsed_data.append(parsed_df)
             successful_files += 1
@@ -155,36 +165,31 @@ def main():
     # Combine all parsed data
     print(f"\nCombining {successful_files} files...")
     
-    # Get all unique columns
-    all_columns = set()
-    for df in parsed_data:
-        all_columns.update(df.columns)
-    
-    all_columns = sorted(list(all_columns))
-    
-    # Standardize all dataframes
-    standardized_dfs = []
-    for df in parsed_data:
-        df_copy = df.copy()
-        for col in all_columns:
-            if col not in df_copy.columns:
-                df_copy[col] = np.nan
-        df_copy = df_copy[all_columns]
-        standardized_dfs.append(df_copy)
+    # Concat unions the columns itself (missing ones become NaN); sort them
+    # afterwards for a stable column order
+    combined_df = pd.concat(parsed_data, ignore_index=True, sort=False)
+    combined_df = combined_df.reindex(columns=sorted(combined_df.columns))
     
-    # Combine
-    combined_df = pd.concat(standardized_dfs, ignore_index=True)
+    # Low-cardinality text columns as categoricals; converted after the concat,
+    # since per-file categories would not survive it
+    for col in ['Team', 'Opp', 'Result', 'GS', 'player_id', 'source_file']:
+        if col in combined_df.columns:
+            combined_df[col] = combined_df[col].astype('category')
     
     # Create injury indicators
     print("Creating injury indicators...")
     combined_df = create_injury_indicators(combined_df)
     
-    # Save the parsed data
-    output_file = os.path.join(output_dir, "flexible_game_data.csv")
-    combined_df.to_csv(output_file, index=False)
+    # Save the parsed data as Parquet, which keeps the dtypes; a small CSV
+    # sample is kept alongside for quick inspection
+    output_file = os.path.join(output_dir, "flexible_game_data.parquet")
+    combined_df.to_parquet(output_file, engine="pyarrow", compression="snappy", index=False)
+    sample_file = os.path.join(output_dir, "flexible_game_data_sample.csv")
+    combined_df.head(100).to_csv(sample_file, index=False)
     
     print(f"\n✅ Successfully parsed flexible game data!")
     print(f"Output file: {output_file}")
+    print(f"Sample CSV: {sample_file}")
     print(f"Total games: {len(combined_df)}")
     print(f"Total players: {combined_df['player_id'].nunique()}")
     print(f"Total columns: {len(combined_df.columns)}")
@@ -198,7 +203,7 @@ def main():
     
     # Show injury summary
     if 'injured' in combined_df.columns:
-        injury_summary = combined_df.groupby('player_id')['injured'].sum().sort_values(ascending=False)
+        injury_summary = combined_df.groupby('player_id', observed=True)['injured'].sum().sort_values(ascending=False)
         print(f"\nInjury summary (games missed per player):")
         print(injury_summary.head(10).to_string())
     
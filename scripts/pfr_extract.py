@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Shared extraction of game data from the PFR gamelog CSVs.
+The game stats are embedded as space-separated strings in the first column.
+Used by extract_real_game_data.py and final_data_extractor.py.
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import os
+import re
+from functools import partial
+from pathlib import Path
+
+from extract_game_data import iter_csv, read_first_column
+from file_pool import map_files
+
+# Whitespace-separated fields of a game string, named by position. The first
+# ten are required; the rushing block needs at least 15 fields and the nested
+# receiving block at least 20, so short rows leave those groups empty.
+GAME_RE = re.compile(
+    r'^\s*(?P<rk>\S+)\s+(?P<gcar>\S+)\s+(?P<gtm>\S+)\s+(?P<week>\S+)\s+(?P<date>\S+)'
+    r'\s+(?P<team>\S+)\s+\S+\s+(?P<opp>\S+)\s+(?P<result>\S+)\s+(?P<gs>\S+)'
+    r'(?:\s+(?P<rushing_att>\S+)\s+(?P<rushing_yds>\S+)\s+(?P<rushing_td>\S+)'
+    r'\s+(?P<rushing_ypa>\S+)\s+(?P<receiving_tgt>\S+)'
+    r'(?:\s+(?P<receiving_rec>\S+)\s+(?P<receiving_yds>\S+)\s+(?P<receiving_ypc>\S+)'
+    r'\s+(?P<receiving_td>\S+)\s+\S+)?)?'
+)
+
+# Output layout of each extractor. 'final' also drops header-like and short
+# rows up front and names the opponent column 'opponent'.
+VARIANTS = {
+    'real': {
+        'title': "Extracting Real Game Data from PFR CSVs",
+        'output_name': "real_game_data",
+        'drop_header_rows': False,
+        'opponent_col': 'opp',
+        'columns': ['rk', 'gcar', 'gtm', 'week', 'date', 'team', 'opp', 'result', 'gs',
+                    'rushing_att', 'rushing_yds', 'rushing_td', 'rushing_ypa',
+                    'receiving_tgt', 'receiving_rec', 'receiving_yds', 'receiving_ypc', 'receiving_td',
+                    'player_id', 'season', 'source_file', 'game_index'],
+    },
+    'final': {
+        'title': "Final PFR Game Data Extractor",
+        'output_name': "final_game_data",
+        'drop_header_rows': True,
+        'opponent_col': 'opponent',
+        'columns': ['player_id', 'season', 'source_file', 'game_index',
+                    'week', 'date', 'team', 'opponent', 'result',
+                    'rushing_att', 'rushing_yds', 'rushing_td',
+                    'receiving_tgt', 'receiving_rec', 'receiving_yds', 'receiving_td'],
+    },
+}
+
+def _digit_tokens(values):
+    """Keep all-digit tokens as they are; anything else (or missing) becomes NaN."""
+    return values.where(values.str.isdigit().fillna(False).astype(bool))
+
+def _digit_counts(values):
+    """Numeric value of all-digit tokens, with anything else counted as 0."""
+    counts = pd.to_numeric(_digit_tokens(values), errors='coerce').fillna(0)
+    return counts.astype('int64')
+
+def parse_game_file(file_path, variant='real', verbose=False):
+    """Parse a PFR CSV file into one row per game, laid out for the given variant."""
+    spec = VARIANTS[variant]
+    if verbose:
+        print(f"Parsing {os.path.basename(file_path)}...")
+    
+    try:
+        # Read the CSV (only the first column is used)
+        df = read_first_column(file_path)
+        
+        # Get player info
+        filename = os.path.basename(file_path)
+        player_id = filename.split('_')[0]
+        season = filename.split('_')[1]
+        
+        # Skip the two header rows and any missing entries
+        rows = df.iloc[2:, 0].dropna().astype(str)
+        if spec['drop_header_rows']:
+            rows = rows[~rows.str.contains('Off%', regex=False) & (rows.str.len() >= 10)]
+        
+        # Match every row against the compiled field pattern at once; rows
+        # with fewer than 10 fields do not match at all
+        fields = rows.str.extract(GAME_RE)
+        fields = fields[fields['rk'].notna()]
+        
+        if fields.empty:
+            print(f"  ✗ No game data extracted from {filename}")
+            return None
+        
+        # Basic game info
+        game_df = pd.DataFrame({
+            'rk': _digit_tokens(fields['rk']),
+            'gcar': _digit_tokens(fields['gcar']),
+            'gtm': _digit_tokens(fields['gtm']),
+            'week': _digit_tokens(fields['week']),
+            'date': fields['date'],
+            'team': fields['team'],
+            spec['opponent_col']: fields['opp'],
+            'result': fields['result'],
+            'gs': fields['gs'],
+        }, index=fields.index)
+        
+        # Rushing stats need at least 15 fields
+        has_rushing = fields['rushing_att'].notna()
+        if has_rushing.any():
+            for col in ['rushing_att', 'rushing_yds', 'rushing_td']:
+                game_df[col] = _digit_counts(fields[col]).where(has_rushing)
+            game_df['rushing_ypa'] = fields['rushing_ypa']
+        
+        # Receiving stats need at least 20 fields
+        has_receiving = fields['receiving_rec'].notna()
+        if has_receiving.any():
+            for col in ['receiving_tgt', 'receiving_rec', 'receiving_yds']:
+                game_df[col] = _digit_counts(fields[col]).where(has_receiving)
+            game_df['receiving_ypc'] = fields['receiving_ypc']
+            game_df['receiving_td'] = _digit_counts(fields['receiving_td']).where(has_receiving)
+        
+        # Add player metadata
+        game_df['player_id'] = player_id
+        game_df['season'] = int(season)
+        game_df['source_file'] = filename
+        game_df['game_index'] = fields.index - 2  # Adjust for header rows
+        
+        game_df = game_df[[col for col in spec['columns'] if col in game_df.columns]]
+        
+        if verbose:
+            print(f"  ✓ Extracted {len(game_df)} games")
+        return game_df.reset_index(drop=True)
+    
+    except Exception as e:
+        print(f"  ✗ Error parsing {file_path}: {e}")
+        return None
+
+def extract(input_dir, output_dir, variant='real', verbose=False):
+    """Extract game data from every CSV in input_dir and save the combined result."""
+    spec = VARIANTS[variant]
+    print(spec['title'])
+    print("=" * (len(spec['title']) + 6))
+    
+    # Create output directory
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    # Find all CSV files with a single directory scan
+    csv_files = list(iter_csv(input_dir))
+    
+    if not csv_files:
+        print("No CSV files found!")
+        return
+    
+    print(f"Found {len(csv_files)} files to process")
+    
+    # Process each file
+    all_game_data = []
+    successful_files = 0
+    
+    results = map_files(partial(parse_game_file, variant=variant, verbose=verbose), csv_files)
+    
+    for game_df in results:
+        if game_df is not None:
+            all_game_data.append(game_df)
+            successful_files += 1
+    
+    if not all_game_data:
+        print("No game data could be extracted!")
+        return
+    
+    # Combine all game data
+    print(f"\nCombining {successful_files} files...")
+    combined_df = pd.concat(all_game_data, ignore_index=True, sort=False)
+    
+    # Drop the per-file frames so only the combined copy stays in memory
+    del all_game_data, results
+    
+    # Clean up the data
+    print("Cleaning extracted data...")
+    
+    # Convert numeric columns
+    numeric_cols = ['week', 'rushing_att', 'rushing_yds', 'rushing_td', 'receiving_tgt', 'receiving_rec', 'receiving_yds', 'receiving_td']
+    for col in numeric_cols:
+        if col in combined_df.columns:
+            combined_df[col] = pd.to_numeric(combined_df[col], errors='coerce').fillna(0)
+    
+    # Create injury indicators
+    combined_df['injured'] = (combined_df['rushing_att'] == 0) & (combined_df['receiving_rec'] == 0)
+    
+    # Save the extracted data
+    output_file = os.path.join(output_dir, f"{spec['output_name']}.csv")
+    # Arrow's multi-threaded writer instead of pandas' per-cell Python formatting
+    table = pa.Table.from_pandas(combined_df, preserve_index=False)
+    pacsv.write_csv(table, output_file)
+    
+    # Parquet sibling of the same table for faster, typed downstream reads
+    parquet_file = os.path.splitext(output_file)[0] + ".parquet"
+    pq.write_table(table, parquet_file, compression="zstd")
+    
+    print(f"\n✅ Successfully extracted game data!")
+    print(f"Output file: {output_file}")
+    print(f"Parquet file: {parquet_file}")
+    print(f"Total games: {len(combined_df)}")
+    print(f"Total players: {combined_df['player_id'].nunique()}")
+    print(f"Columns: {list(combined_df.columns)}")
+    
+    # Show sample
+    print(f"\nSample of extracted data:")
+    display_cols = ['player_id', 'week', 'team', spec['opponent_col'], 'rushing_att', 'rushing_yds', 'rushing_td', 'receiving_rec', 'receiving_yds', 'injured']
+    available_cols = [col for col in display_cols if col in combined_df.columns]
+    print(combined_df[available_cols].head(10).to_string(index=False))
+    
+    # Show injury summary
+    if 'injured' in combined_df.columns:
+        injury_summary = combined_df.groupby('player_id')['injured'].sum().sort_values(ascending=False)
+        print(f"\nInjury summary (games missed per player):")
+        print(injury_summary.head(10).to_string())
+    
+    # Show stats summary
+    if 'rushing_att' in combined_df.columns:
+        print(f"\nRushing stats summary:")
+        print(f"Total rushing attempts: {combined_df['rushing_att'].sum():.0f}")
+        print(f"Total rushing yards: {combined_df['rushing_yds'].sum():.0f}")
+        print(f"Total rushing TDs: {combined_df['rushing_td'].sum():.0f}")
+    
+    return combined_df
@@ -6,11 +6,16 @@ Process 2022 season data using the same approach that worked for 2023.
 import pandas as pd
 import numpy as np
 import os
+import re
 import glob
 from pathlib import Path
 
+from file_pool import map_files
+
 def parse_2022_file(filepath):
     """Parse a 2022 CSV file with the same approach as 2023."""
+    print(f"Processing {os.path.basename(filepath)}...")
+    
     try:
         # Read the file with pandas, handling the multi-level headers
         # Skip the first row (category headers) and use the second row as column names
@@ -81,16 +86,15 @@ def process_2022_data():
     all_dataframes = []
     successful_files = 0
     
-    for csv_file in csv_files:
-        print(f"Processing {os.path.basename(csv_file)}...")
-        
-        parsed_df = parse_2022_file(csv_file)
+    results = map_files(parse_2022_file, csv_files)
+    
+    for csv_file, parsed_df in zip(csv_files, results):
         if parsed_df is not None and len(parsed_df) > 0:
             # Save individual processed file
             filename = os.path.basename(csv_file)
-            output_filename = f"processed_{filename}"
+            output_filename = f"processed_{os.path.splitext(filename)[0]}.parquet"
             output_path = os.path.join(output_dir, output_filename)
-            parsed_df.to_csv(output_path, index=False)
+            parsed_df.to_parquet(output_path, engine="pyarrow", compression="snappy", index=False)
             
             all_dataframes.append(parsed_df)
             successful_files += 1
@@ -103,49 +107,53 @@ def process_2022_data():
     
     print(f"\nCombining {successful_files} files for 2022...")
     
-    # Get all unique columns
-    all_columns = set()
-    for df in all_dataframes:
-        all_columns.update(df.columns)
-    
-    all_columns = sorted(list(all_columns))
-    print(f"Total unique columns: {len(all_columns)}")
+    # Concat unions the columns itself (missing ones become NaN); sort them
+    # afterwards for a stable column order
+    combined_df = pd.concat(all_dataframes, ignore_index=True, sort=False)
+    combined_df = combined_df.reindex(columns=sorted(combined_df.columns))
     
-    # Standardize all dataframes
-    standardized_dfs = []
-    for df in all_dataframes:
-        df_copy = df.copy()
-        for col in all_columns:
-            if col not in df_copy.columns:
-                df_copy[col] = np.nan
-        df_copy = df_copy[all_columns]
-        standardized_dfs.append(df_copy)
-    
-    # Combine all dataframes
-    combined_df = pd.concat(standardized_dfs, ignore_index=True)
+    # Low-cardinality text columns as categoricals; converted after the concat,
+    # since per-file categories would not survive it
+    for col in ['Team', 'Opp', 'Result', 'GS', 'player_id', 'source_file']:
+        if col in combined_df.columns:
+            combined_df[col] = combined_df[col].astype('category')
+    print(f"Total unique columns: {len(combined_df.columns)}")
     
     # Create injury indicators
     print("Creating injury indicators...")
-    combined_df['injured'] = False
+    injured = np.zeros(len(combined_df), dtype=bool)
     
-    # Check for injury indicators
+    # Check for injury indicators with a single alternation scan per column
     injury_indicators = ['Did Not Play', 'Inactive', 'Injured Reserve', 'PUP', 'Suspended']
+    injury_pattern = '|'.join(map(re.escape, injury_indicators))
     
     for col in ['GS', 'Result', 'Team']:
         if col in combined_df.columns:
-            for indicator in injury_indicators:
-                combined_df.loc[combined_df[col].astype(str).str.contains(indicator, case=False, na=False), 'injured'] = True
+            # Text columns are already strings; only convert the others, once
+            values = combined_df[col]
+            if not pd.api.types.is_string_dtype(values):
+                values = values.astype(str)
+            injured |= values.str.contains(injury_pattern, case=False, na=False).to_numpy(dtype=bool)
     
     # Also check if key stats are missing (might indicate injury)
     if 'Att' in combined_df.columns and 'Rec' in combined_df.columns:
-        combined_df.loc[(combined_df['Att'].isna() | (combined_df['Att'] == 0)) & (combined_df['Rec'].isna() | (combined_df['Rec'] == 0)), 'injured'] = True
+        att_missing = (combined_df['Att'].isna() | combined_df['Att'].eq(0)).to_numpy(dtype=bool)
+        rec_missing = (combined_df['Rec'].isna() | combined_df['Rec'].eq(0)).to_numpy(dtype=bool)
+        injured |= att_missing & rec_missing
+    
+    combined_df['injured'] = injured
     
     # Save the combined data for 2022
-    output_file = os.path.join(output_dir, "2022_combined_data.csv")
-    combined_df.to_csv(output_file, index=False)
+    output_file = os.path.join(output_dir, "2022_combined_data.parquet")
+    combined_df.to_parquet(output_file, engine="pyarrow", compression="snappy", index=False)
+    
+    # The season combiners still read the CSV, so keep writing it too
+    csv_file = os.path.join(output_dir, "2022_combined_data.csv")
+    combined_df.to_csv(csv_file, index=False)
     
     print(f"\n✅ Successfully processed 2022 season data!")
     print(f"Output file: {output_file}")
+    print(f"CSV file: {csv_file}")
     print(f"Total games: {len(combined_df)}")
     print(f"Total players: {combined_df['player_id'].nunique()}")
     print(f"Total columns: {len(combined_df.columns)}")
@@ -159,7 +167,7 @@ def process_2022_data():
     
     # Show injury summary
     print(f"\nInjury summary for 2022:")
-    injury_summary = combined_df.groupby('player_id')['injured'].sum().sort_values(ascending=False)
+    injury_summary = combined_df.groupby('player_id', observed=True)['injured'].sum().sort_values(ascending=False)
     print(injury_summary[injury_summary > 0].to_string())
     
     # Show player summary (only if columns exist)
@@ -180,7 +188,7 @@ def process_2022_data():
     
     if summary_cols:
         agg_dict = {col: (orig_col, func) for col, (orig_col, func) in summary_cols.items()}
-        player_summary = combined_df.groupby('player_id').agg(agg_dict).round(1)
+        player_summary = combined_df.groupby('player_id', observed=True).agg(agg_dict).round(1)
         print(player_summary.head(10).to_string())
     
     return combined_df
@@ -5,7 +5,6 @@ Usage: python3 scripts/process_season_data.py --season 2023
 '''
 
 import pandas as pd
-import numpy as np
 import os
 import glob
 import argparse
@@ -54,8 +53,7 @@ def process_season_data(season):
                     clean_column_names.append(str(col))
             
             # Create a clean dataframe starting from row 2
-            data_df = df.iloc[2:].copy()
-            data_df.columns = clean_column_names
+            data_df = df.iloc[2:].set_axis(clean_column_names, axis=1)
             
             # Remove columns that are all NaN
             data_df = data_df.dropna(axis=1, how='all')
@@ -101,17 +99,10 @@ def process_season_data(season):
     all_columns = sorted(list(all_columns))
     
     # Standardize all dataframes
-    standardized_dfs = []
-    for df in all_data:
-        df_copy = df.copy()
-        for col in all_columns:
-            if col not in df_copy.columns:
-                df_copy[col] = np.nan
-        df_copy = df_copy[all_columns]
-        standardized_dfs.append(df_copy)
+    standardized_dfs = [df.reindex(columns=all_columns) for df in all_data]
     
     # Combine
-    combined_df = pd.concat(standardized_dfs, ignore_index=True)
+    combined_df = pd.concat(standardized_dfs, ignore_index=True, sort=False)
     
     # Create injury indicators
     print("Creating injury indicators...")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Incremental cache for the weekly game log cleaning scripts.
+Cleaned per-file DataFrames are stored as Parquet alongside a manifest of
+source file signatures, so re-runs only clean the CSVs that changed.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+MANIFEST_NAME = '.manifest.json'
+
+def file_signature(file_path):
+    """Return a cheap change signature (mtime, size) for a file."""
+    stat = os.stat(file_path)
+    return [stat.st_mtime, stat.st_size]
+
+class CleanedFileCache:
+    """Cache of cleaned DataFrames keyed by source file name and signature.
+
+    The whole cache is invalidated when the cleaning script itself changes,
+    so edits to the cleaning logic never serve stale results.
+    """
+
+    def __init__(self, cache_dir, cleaner_file):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_path = self.cache_dir / MANIFEST_NAME
+        self.cleaner_signature = file_signature(cleaner_file)
+        self.files = self._load_manifest()
+
+    def _load_manifest(self):
+        """Load the file manifest, discarding it if the cleaner changed."""
+        if not self.manifest_path.exists():
+            return {}
+
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get('cleaner') != self.cleaner_signature:
+            return {}
+        return manifest.get('files', {})
+
+    def _cache_path(self, file_path):
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        return self.cache_dir / f"{stem}.parquet"
+
+    def get(self, file_path):
+        """Return the cached cleaned DataFrame, or None if the file changed."""
+        cache_path = self._cache_path(file_path)
+        entry = self.files.get(os.path.basename(file_path))
+
+        if entry != file_signature(file_path) or not cache_path.exists():
+            return None
+
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            print(f"  ✗ Could not read cache for {file_path}: {e}")
+            return None
+
+    def put(self, file_path, df):
+        """Store a cleaned DataFrame and record the source file signature."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            df.to_parquet(self._cache_path(file_path), index=False)
+        except Exception as e:
+            print(f"  ✗ Could not cache {file_path}: {e}")
+            return
+
+        self.files[os.path.basename(file_path)] = file_signature(file_path)
+
+    def save(self):
+        """Write the manifest to disk."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {'cleaner': self.cleaner_signature, 'files': self.files}
+        self.manifest_path.write_text(json.dumps(manifest, indent=2))